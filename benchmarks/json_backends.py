@@ -0,0 +1,62 @@
+"""Compare JSON backends on list payloads, as used by ``GenericClient``.
+
+Usage::
+
+    $ python benchmarks/json_backends.py [--items 10000] [--repeat 5]
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import requests
+
+from genericclient import GenericClient
+from genericclient.json_backends import available_backends
+
+
+def make_payload(items):
+    return [
+        {
+            'id': i,
+            'uuid': '1c8d2c8e-{:04x}-4ec4-b3b5-3f9d1a5b{:04x}'.format(i % 65536, i % 65536),
+            'username': 'user{}'.format(i),
+            'email': 'user{}@example.com'.format(i),
+            'active': i % 3 != 0,
+            'score': i * 1.5,
+            'groups': ['watchers', 'contributors'][:i % 3],
+            'profile': {'bio': u'Bio of user {} - caf\xe9'.format(i), 'followers': i * 7},
+        }
+        for i in range(items)
+    ]
+
+
+def make_response(content):
+    response = requests.models.Response()
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response._content = content
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_payload(args.items)
+    content = available_backends()[-1].dumps(payload).encode('utf-8')
+    print('{} items, {:.1f} KiB\n'.format(args.items, len(content) / 1024.0))
+    print('{:<12} {:>12} {:>12}'.format('backend', 'dumps (ms)', 'hydrate (ms)'))
+
+    for backend in available_backends():
+        client = GenericClient('http://example.org', json_backend=backend)
+        response = make_response(content)
+        dumps = min(timeit.repeat(lambda: backend.dumps(payload), number=1, repeat=args.repeat))
+        hydrate = min(timeit.repeat(lambda: client.hydrate_data(response), number=1, repeat=args.repeat))
+        print('{:<12} {:>12.2f} {:>12.2f}'.format(backend.name, dumps * 1000, hydrate * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Compare the memory used by a ``ResourceSet`` of ``Resource`` and a ``LazyResourceSet`` of ``CompactResource``.
+
+A ``CompactResource`` still has a ``__dict__``, inherited from ``BaseResource``, but it stays empty: the figures
+include it.
+
+Usage::
+
+    $ python benchmarks/resource_memory.py [--items 100000]
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from genericclient import CompactResource, Endpoint, GenericClient, LazyResourceSet, ParsedResponse
+
+
+class CompactEndpoint(Endpoint):
+    resource_class = CompactResource
+    resource_set_class = LazyResourceSet
+
+
+def make_payload(items):
+    return [
+        {
+            'id': i,
+            'username': 'user{}'.format(i),
+            'email': 'user{}@example.com'.format(i),
+            'active': i % 3 != 0,
+            'score': i * 1.5,
+            'group': 'watchers',
+        }
+        for i in range(items)
+    ]
+
+
+def measure(endpoint, content, touch):
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(content)
+    response = ParsedResponse(status_code=200, headers={}, data=data)
+    decoded = tracemalloc.get_traced_memory()[0]
+    resources = endpoint.resource_set_class.from_results(endpoint, response, data)
+    if touch:
+        for resource in resources:
+            resource.id
+    total = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return decoded, total - decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=100000)
+    args = parser.parse_args()
+
+    client = GenericClient('http://example.org')
+    content = json.dumps(make_payload(args.items))
+    endpoints = [
+        ('Resource', Endpoint(client, 'users')),
+        ('Compact', CompactEndpoint(client, 'users')),
+    ]
+
+    print('{} items\n'.format(args.items))
+    print('{:<24} {:>14} {:>14} {:>14}'.format('resources', 'decoded (MiB)', 'on top (MiB)', 'per item (B)'))
+    for name, endpoint in endpoints:
+        for touch in (False, True):
+            decoded, resources = measure(endpoint, content, touch)
+            label = '{} ({})'.format(name, 'all accessed' if touch else 'untouched')
+            print('{:<24} {:>14.1f} {:>14.1f} {:>14.0f}'.format(
+                label, decoded / 2.0 ** 20, resources / 2.0 ** 20, resources / float(args.items),
+            ))
+
+
+if __name__ == '__main__':
+    main()
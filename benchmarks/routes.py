@@ -0,0 +1,75 @@
+"""Measure the overhead of resolving endpoints and routes, without any network access.
+
+Compares building ``client.users(id=2).notify`` (and calling it against an in-memory adapter) with the
+uncached endpoints and routes of ``genericclient_base``, and with the memoized ones of ``genericclient``.
+
+Usage::
+
+    $ python benchmarks/routes.py [--number 200000]
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import requests
+from genericclient_base import BaseGenericClient, routes as base_routes
+from requests.adapters import BaseAdapter
+
+from genericclient import Endpoint, GenericClient
+
+
+class InMemoryAdapter(BaseAdapter):
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Type'] = 'application/json'
+        response._content = b'{}'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class UncachedEndpoint(Endpoint):
+    detail_route_class = base_routes.DetailRoute
+    list_route_class = base_routes.ListRoute
+
+
+class UncachedClient(GenericClient):
+    endpoint_class = UncachedEndpoint
+    __getattr__ = BaseGenericClient.__getattr__
+    __getitem__ = BaseGenericClient.__getitem__
+
+
+def measure(number, func):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=200000)
+    args = parser.parse_args()
+
+    clients = [
+        ('uncached', UncachedClient('http://example.org', adapter=InMemoryAdapter(), trailing_slash=True)),
+        ('cached', GenericClient('http://example.org', adapter=InMemoryAdapter(), trailing_slash=True)),
+    ]
+    cases = [
+        ('client.users', lambda client: lambda: client.users, args.number),
+        ('client.users(id=2).notify', lambda client: lambda: client.users(id=2).notify, args.number),
+        ('client.users().notify', lambda client: lambda: client.users().notify, args.number),
+        ('client.users(id=2).notify()', lambda client: lambda: client.users(id=2).notify(), args.number // 20),
+    ]
+
+    print('{:<30} {:>14} {:>14} {:>9}'.format('', 'uncached (us)', 'cached (us)', 'speedup'))
+    for label, make, number in cases:
+        timings = [measure(number, make(client)) for _, client in clients]
+        print('{:<30} {:>14.2f} {:>14.2f} {:>8.1f}x'.format(label, timings[0], timings[1], timings[0] / timings[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""A local HTTP server emulating a paginated REST API, for the benchmarks.
+
+Endpoints, for any name:
+
+* ``GET /<name>``: a page of items, with a ``Link`` header to the next page (``?page=N``),
+* ``GET /<name>/<pk>``: one item,
+* ``POST /<name>``: creates an item, ``PUT /<name>/<pk>``: updates it,
+* ``POST /<name>/<pk>/<action>`` and ``POST /<name>/<action>``: routes.
+
+Usage::
+
+    $ python benchmarks/server.py [--port 8000] [--item-size 256] [--page-size 100] [--pages 10] [--latency 0]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qsl, urlparse
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qsl, urlparse
+
+
+class Config(object):
+
+    def __init__(self, item_size=256, page_size=100, pages=10, latency=0):
+        self.item_size = item_size
+        self.page_size = page_size
+        self.pages = pages
+        self.latency = latency
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def make_item(pk, size):
+    item = {'id': pk, 'username': 'user{}'.format(pk), 'active': pk % 2 == 0, 'score': pk * 1.5}
+    padding = size - len(json.dumps(item)) - len(', "bio": ""')
+    item['bio'] = 'x' * max(0, padding)
+    return item
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately: don't let Nagle's algorithm delay the body.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body, headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length).decode('utf-8')) if length else {}
+
+    def route(self):
+        if self.server.config.latency:
+            time.sleep(self.server.config.latency)
+        url = urlparse(self.path)
+        return [part for part in url.path.split('/') if part], dict(parse_qsl(url.query))
+
+    def do_GET(self):
+        parts, query = self.route()
+        if len(parts) == 1:
+            page = int(query.get('page', 1))
+            headers = []
+            if page < self.server.config.pages:
+                headers.append(('Link', '<http://{}:{}/{}?page={}>; rel="next"'.format(
+                    self.server.server_address[0], self.server.server_address[1], parts[0], page + 1,
+                )))
+            return self.send_json(200, self.server.pages[min(page, len(self.server.pages)) - 1], headers)
+        if len(parts) == 2 and parts[1].isdigit():
+            return self.send_json(200, self.server.item)
+        self.send_json(404, b'{"detail": "Not found."}')
+
+    def do_POST(self):
+        parts, query = self.route()
+        payload = self.read_body()
+        if len(parts) == 1:
+            payload['id'] = 1
+            return self.send_json(201, json.dumps(payload).encode('utf-8'))
+        self.send_json(200, b'{"ok": true}')
+
+    def do_PUT(self):
+        parts, query = self.route()
+        self.send_json(200, json.dumps(self.read_body()).encode('utf-8'))
+
+
+class MockAPIServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, config):
+        HTTPServer.__init__(self, address, Handler)
+        self.config = config
+        self.item = json.dumps(make_item(1, config.item_size)).encode('utf-8')
+        # Pages are encoded once: the server shouldn't be what's measured.
+        self.pages = [
+            json.dumps([
+                make_item(page * config.page_size + i, config.item_size) for i in range(config.page_size)
+            ]).encode('utf-8')
+            for page in range(config.pages)
+        ]
+
+    @property
+    def url(self):
+        return 'http://{}:{}'.format(*self.server_address[:2])
+
+
+def serve(config, host='127.0.0.1', port=0, ready=None):
+    server = MockAPIServer((host, port), config)
+    if ready is not None:
+        ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start(config, host='127.0.0.1', port=0):
+    """Start a server in a separate process, to leave the client alone in this one."""
+    import multiprocessing
+
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(config, host, port, ready))
+    process.daemon = True
+    process.start()
+    return process, 'http://{}:{}'.format(host, ready.get(timeout=10))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--item-size', type=int, default=256)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0)
+    args = parser.parse_args()
+
+    config = Config(args.item_size, args.page_size, args.pages, args.latency)
+    server = MockAPIServer((args.host, args.port), config)
+    print('Serving on {}'.format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
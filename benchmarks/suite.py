@@ -0,0 +1,221 @@
+"""Benchmark the client against a local mock API, and store the results as JSON.
+
+Each scenario runs in each mode (``sequential``, ``threaded`` on a ``thread_safe``
+client, and ``async`` with ``AsyncGenericClient`` when ``aiohttp`` is installed),
+and reports throughput, latency percentiles and peak memory use.
+
+Usage::
+
+    $ python benchmarks/suite.py [--ops 200] [--workers 8] [--output results.json] [--compare baseline.json]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from concurrent.futures import ThreadPoolExecutor
+
+import server
+
+import genericclient
+from genericclient import GenericClient
+from genericclient.cache import MemoryCache
+from genericclient.pagination import PrefetchLinkHeader, link_header
+
+try:
+    import asyncio
+    from genericclient.aio import AsyncGenericClient
+except ImportError:
+    AsyncGenericClient = None
+
+
+MODES = ('sequential', 'threaded', 'async')
+
+
+def scenarios():
+    """``(name, client options, operation)``; operations are called with a client and an op number."""
+    return [
+        ('get', {}, lambda client, i: client.items.get(id=i + 1)),
+        ('all', {}, lambda client, i: client.items.all()),
+        ('filter', {}, lambda client, i: client.items.filter(active=True)),
+        ('create', {}, lambda client, i: client.items.create({'username': 'user{}'.format(i)})),
+        ('route', {}, lambda client, i: client.items(id=i + 1).touch(reason='benchmark')),
+        ('paginate', {'autopaginate': link_header}, lambda client, i: client.items.all()),
+        ('paginate_prefetch', {'autopaginate': PrefetchLinkHeader(max_workers=4)}, lambda client, i: client.items.all()),
+        # Ten items, fetched once each and then served from the cache: compare with ``get``.
+        ('get_cached', {'cache': MemoryCache(default_ttl=60)}, lambda client, i: client.items.get(id=i % 10 + 1)),
+    ]
+
+
+async def _await(result):
+    return await result
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def timed(operation, client, i, latencies):
+    started = time.perf_counter()
+    operation(client, i)
+    latencies.append(time.perf_counter() - started)
+
+
+def run_sequential(url, options, operation, ops, workers):
+    client = GenericClient(url, **options)
+    latencies = []
+    for i in range(ops):
+        timed(operation, client, i, latencies)
+    return latencies
+
+
+def run_threaded(url, options, operation, ops, workers):
+    client = GenericClient(url, thread_safe=True, pool_maxsize=workers, **options)
+    latencies = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda i: timed(operation, client, i, latencies), range(ops)))
+    return latencies
+
+
+def run_async(url, options, operation, ops, workers):
+    try:
+        AsyncGenericClient(url, **options)
+    except (TypeError, ValueError):
+        # Synchronous paginators, like ``PrefetchLinkHeader``, or options it doesn't have, like ``cache``.
+        return None
+
+    async def run():
+        latencies = []
+        semaphore = asyncio.Semaphore(workers)
+
+        async def one(client, i):
+            async with semaphore:
+                started = time.perf_counter()
+                await _await(operation(client, i))
+                latencies.append(time.perf_counter() - started)
+
+        async with AsyncGenericClient(url, limit=workers, **options) as client:
+            await asyncio.gather(*[one(client, i) for i in range(ops)])
+        return latencies
+
+    return asyncio.run(run())
+
+
+RUNNERS = {
+    'sequential': run_sequential,
+    'threaded': run_threaded,
+    'async': run_async,
+}
+
+
+def peak_memory(runner, url, options, operation, workers):
+    # A separate, short run: tracing allocations slows down the timed one.
+    tracemalloc.start()
+    try:
+        runner(url, options, operation, workers, workers)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(url, ops, workers, modes, only=None):
+    results = []
+    for index, (name, _, _) in enumerate(scenarios()):
+        if only and name not in only:
+            continue
+        for mode in modes:
+            # New options for each run, so that a cache isn't shared between them.
+            _, options, operation = scenarios()[index]
+            started = time.perf_counter()
+            latencies = RUNNERS[mode](url, options, operation, ops, workers)
+            elapsed = time.perf_counter() - started
+            if latencies is None:
+                print('{:<18} {:<11} {:>10}'.format(name, mode, 'unsupported'))
+                continue
+            _, options, operation = scenarios()[index]
+            memory = peak_memory(RUNNERS[mode], url, options, operation, workers)
+            results.append({
+                'scenario': name,
+                'mode': mode,
+                'ops': ops,
+                'seconds': elapsed,
+                'throughput': ops / elapsed,
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p90_ms': percentile(latencies, 90) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'peak_memory_kib': memory / 1024.0,
+            })
+            print_result(results[-1])
+    return results
+
+
+def print_result(result, baseline=None):
+    line = '{scenario:<18} {mode:<11} {throughput:>10.1f} {p50_ms:>9.2f} {p90_ms:>9.2f} {p99_ms:>9.2f} {peak_memory_kib:>11.1f}'
+    line = line.format(**result)
+    if baseline is not None:
+        line += ' {:>+8.1f}%'.format((result['throughput'] / baseline['throughput'] - 1) * 100)
+    print(line)
+
+
+def compare(results, path):
+    with open(path) as f:
+        baseline = {(result['scenario'], result['mode']): result for result in json.load(f)['results']}
+    print('\nCompared to {} (throughput):\n'.format(path))
+    for result in results:
+        print_result(result, baseline.get((result['scenario'], result['mode'])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ops', type=int, default=200, help='Operations per scenario and mode.')
+    parser.add_argument('--workers', type=int, default=8, help='Threads, or concurrent tasks, in parallel modes.')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--scenarios', nargs='+', help='Only run these scenarios.')
+    parser.add_argument('--item-size', type=int, default=256, help='Approximate size of an item, in bytes.')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0, help='Server latency, in seconds.')
+    parser.add_argument('--output', help='Write the results to this JSON file.')
+    parser.add_argument('--compare', help='Compare the results to a previous JSON file.')
+    args = parser.parse_args()
+
+    modes = [mode for mode in args.modes if mode != 'async' or AsyncGenericClient is not None]
+    config = server.Config(args.item_size, args.page_size, args.pages, args.latency)
+    process, url = server.start(config)
+
+    print('{:<18} {:<11} {:>10} {:>9} {:>9} {:>9} {:>11}'.format(
+        'scenario', 'mode', 'ops/s', 'p50 (ms)', 'p90 (ms)', 'p99 (ms)', 'peak (KiB)',
+    ))
+    try:
+        results = run(url, args.ops, args.workers, modes, args.scenarios)
+    finally:
+        process.terminate()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {
+                    'genericclient': genericclient._version,
+                    'python': sys.version.split()[0],
+                    'platform': platform.platform(),
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                    'ops': args.ops,
+                    'workers': args.workers,
+                    'server': config.to_dict(),
+                },
+                'results': results,
+            }, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
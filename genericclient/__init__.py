@@ -1,75 +1,1009 @@
+import codecs
+import contextlib
+import copy
+import functools
+import inspect
+import itertools
+import threading
+import time
+
+try:
+    from urllib.parse import parse_qs, parse_qsl, urlparse, urlunparse
+except ImportError:
+    from urlparse import parse_qs, parse_qsl, urlparse, urlunparse
+
 import requests
+from requests.adapters import BaseAdapter, DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE
+from requests.structures import CaseInsensitiveDict
 
 from genericclient_base import (
-    BaseEndpoint, BaseGenericClient, BaseResource, exceptions, ParsedResponse
+    BaseEndpoint, BaseGenericClient, BaseResource, BaseResourceSet, ParsedResponse
 )
 
+from . import (
+    adapters, batch, bulk, cache, columns, exceptions, json_backends, pagination, ratelimit, routes, singleflight,
+    utils,
+)
+from .compression import accept_encoding, check_encoding, compress
+from .retry import Retry
+from .tracing import Tracer
+
 
 _version = "1.4.2"
 __version__ = VERSION = tuple(map(int, _version.split('.')))
 
 
 class Resource(BaseResource):
-    pass
+    whitelist = BaseResource.whitelist + ('_dirty',)
+    # The fields set since it was received, for resources requested with ``_fields``.
+    _dirty = None
+
+    @classmethod
+    def wrap(cls, endpoint, data, response=None):
+        resource = cls(endpoint, response, **data)
+        if getattr(endpoint, '_partial', False):
+            resource._track_changes()
+        return resource
+
+    def __setattr__(self, name, value):
+        super(Resource, self).__setattr__(name, value)
+        if self._dirty is not None and name != 'whitelist' and name not in self.whitelist:
+            self._dirty.add(name)
+
+    def _track_changes(self):
+        self._dirty = set()
+
+    def _changes(self):
+        return {key: self.payload[key] for key in self._dirty if key in self.payload}
+
+    def save(self):
+        if self._dirty is None:
+            return super(Resource, self).save()
+        # Sending a partial representation with ``PUT`` or ``POST`` would lose or duplicate data.
+        if self.pk is None:
+            raise exceptions.UnknownPK("Can't save a partial `{}` without its primary key.".format(self._endpoint.name))
+        response = self._endpoint.request('patch', self._urljoin(self.pk), json=self._changes())
+        self.payload = response.data
+        self._dirty = None
+        return self
+
+
+class CompactResource(Resource):
+    """A ``Resource`` storing its own attributes in ``__slots__``.
+
+    Its ``__dict__``, inherited from ``BaseResource``, stays empty.
+
+    It keeps a reference to the ``dict`` decoded from the response instead
+    of a copy, and only copies it when the resource is first modified, or
+    when ``.payload`` is accessed.
+    """
+    __slots__ = ('_endpoint', '_payload', '_owned', 'response')
+    whitelist = Resource.whitelist + ('_payload', '_owned')
+
+    def __init__(self, endpoint, response=None, **kwargs):
+        super(CompactResource, self).__init__(endpoint, response, **kwargs)
+        self._owned = True
+
+    @classmethod
+    def wrap(cls, endpoint, data, response=None):
+        resource = cls.__new__(cls)
+        object.__setattr__(resource, '_endpoint', endpoint)
+        object.__setattr__(resource, '_payload', data)
+        object.__setattr__(resource, '_owned', False)
+        object.__setattr__(resource, 'response', response)
+        if getattr(endpoint, '_partial', False):
+            resource._track_changes()
+        return resource
+
+    @property
+    def payload(self):
+        if not self._owned:
+            self._payload = dict(self._payload)
+            self._owned = True
+        return self._payload
+
+    @payload.setter
+    def payload(self, value):
+        self._payload = value
+        self._owned = False
+
+    def __getattr__(self, name):
+        try:
+            return self._payload[name]
+        except KeyError:
+            raise AttributeError("{} on endpoint `{}` has not attribute '{}'".format(
+                self.__class__.__name__,
+                self._endpoint.name,
+                name,
+            ))
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactResource):
+            return super(CompactResource, self).__eq__(other)
+        if self._payload != other._payload and self.pk == other.pk:
+            raise exceptions.AmbiguousComparison(
+                "Payloads are different, but {}:{} is the same.".format(
+                    self.pk_name, self.pk
+                )
+            )
+        return self._payload == other._payload
+
+    __hash__ = None
+
+    @property
+    def pk_name(self):
+        if 'id' in self._payload:
+            return 'id'
+        if 'uuid' in self._payload:
+            return 'uuid'
+        return None
+
+    @property
+    def pk(self):
+        if self.pk_name is not None:
+            return self._payload.get(self.pk_name)
+        return None
+
+
+class ResourceSet(BaseResourceSet):
+
+    @classmethod
+    def from_results(cls, endpoint, response, results):
+        return cls(response, [endpoint.resource_class.wrap(endpoint, result) for result in results])
+
+    def rows(self):
+        for resource in self:
+            yield resource.payload
+
+    def to_columns(self, format='columns'):
+        return columns.to_columns(self.rows(), format, self.response)
+
+
+def _hydrating(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.hydrate()
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+
+class LazyResourceSet(ResourceSet):
+    """A ``ResourceSet`` building each resource the first time it's accessed.
+
+    Until then, it holds the ``dict`` decoded from the response.
+    """
+
+    def __init__(self, response, items, endpoint=None):
+        super(LazyResourceSet, self).__init__(response, items)
+        self.endpoint = endpoint
+
+    @classmethod
+    def from_results(cls, endpoint, response, results):
+        return cls(response, results, endpoint)
+
+    def _resource(self, index):
+        item = list.__getitem__(self, index)
+        if isinstance(item, dict):
+            item = self.endpoint.resource_class.wrap(self.endpoint, item)
+            list.__setitem__(self, index, item)
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._resource(i) for i in range(*index.indices(len(self)))]
+        return self._resource(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._resource(i)
+
+    def __reversed__(self):
+        for i in reversed(range(len(self))):
+            yield self._resource(i)
+
+    def hydrate(self):
+        for i in range(len(self)):
+            self._resource(i)
+
+    def rows(self):
+        for item in list.__iter__(self):
+            if isinstance(item, dict):
+                yield item
+            elif isinstance(item, CompactResource):
+                yield item._payload
+            else:
+                yield item.payload
+
+    def copy(self):
+        return list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyResourceSet):
+            other.hydrate()
+        self.hydrate()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __radd__(self, other):
+        # ``[...] + lazy_set``: Python tries the reflected method of a subclass first.
+        if not isinstance(other, list):
+            return NotImplemented
+        self.hydrate()
+        return list.__add__(other, self)
+
+    def __getslice__(self, i, j):
+        # Python 2 slices lists with ``__getslice__`` when defined.
+        return self[max(i, 0):max(j, 0)]
+
+    __contains__ = _hydrating('__contains__')
+    __add__ = _hydrating('__add__')
+    __mul__ = _hydrating('__mul__')
+    __rmul__ = _hydrating('__rmul__')
+    __imul__ = _hydrating('__imul__')
+    __lt__ = _hydrating('__lt__')
+    __le__ = _hydrating('__le__')
+    __gt__ = _hydrating('__gt__')
+    __ge__ = _hydrating('__ge__')
+    __repr__ = _hydrating('__repr__')
+    count = _hydrating('count')
+    index = _hydrating('index')
+    pop = _hydrating('pop')
+    remove = _hydrating('remove')
+    reverse = _hydrating('reverse')
+    sort = _hydrating('sort')
+
+
+class Query(object):
+    """The results of ``endpoint.filter(**params)``, requested when iterated or indexed.
+
+    Slices and indexes only fetch the pages they need.
+    """
+
+    def __init__(self, endpoint, params):
+        self.endpoint = endpoint
+        self.params = params
+
+    def __repr__(self):
+        return '<{0} on `{1}` with `{2!r}`>'.format(self.__class__.__name__, self.endpoint.url, self.params)
+
+    def __iter__(self):
+        return self.endpoint.iter_filter(**self.params)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            if index < 0:
+                return self.endpoint.filter(**self.params)[index]
+            return self.endpoint.filter(_limit=index + 1, **self.params)[index]
+        if any(value is not None and value < 0 for value in (index.start, index.stop)):
+            return self.endpoint.filter(**self.params)[index]
+        results = self.endpoint.filter(_limit=index.stop, **self.params)
+        if index.stop is not None and not index.start and index.step in (None, 1):
+            return results
+        return results[index]
+
+    def all(self):
+        return self.endpoint.filter(**self.params)
+
+
+CALL_OPTIONS = ('timeout', 'deadline', 'fields')
+HOOKS = ('before_request', 'after_response', 'on_retry', 'on_page', 'after_pages')
+
+
+def call_options(func):
+    # Lets ``func`` take ``_timeout``, ``_deadline`` and ``_fields``, which apply to all the requests it makes.
+    def pop_options(kwargs):
+        return {name: kwargs.pop('_' + name, None) for name in CALL_OPTIONS}
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self._call('{}.{}'.format(self.name, func.__name__), **pop_options(kwargs)) as endpoint:
+                for item in func(endpoint, *args, **kwargs):
+                    yield item
+    else:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self._call('{}.{}'.format(self.name, func.__name__), **pop_options(kwargs)) as endpoint:
+                return func(endpoint, *args, **kwargs)
+    return wrapper
 
 
 class Endpoint(BaseEndpoint):
     resource_class = Resource
+    resource_set_class = ResourceSet
+    detail_route_class = routes.DetailRoute
+    list_route_class = routes.ListRoute
+    bulk_url = None
+    bulk_chunk_size = 100
+    timeout = None
+    deadline = None
+    fields_param = 'fields'
+    fields_separator = ','
+    fields_pk = 'id'
+    trim_fields = True
+    page_size_param = None
+    _deadline_at = None
+    _fields = None
+    _partial = False
+    _trace_context = None
+    _record_requests = False
 
-    def request(self, method, url, *args, **kwargs):
-        resp = getattr(self.api.session, method)(url, *args, **kwargs)
-        response = ParsedResponse(
-            status_code=resp.status_code,
-            headers=resp.headers,
-            data=self.api.hydrate_data(resp),
-        )
+    def __call__(self, _method='post', _timeout=None, _deadline=None, **kwargs):
+        endpoint = self
+        if _timeout is not None or _deadline is not None:
+            endpoint = copy.copy(self)
+            endpoint.timeout = _timeout if _timeout is not None else self.timeout
+            endpoint.deadline = _deadline if _deadline is not None else self.deadline
+        return super(Endpoint, endpoint).__call__(_method, **kwargs)
 
-        if response.status_code in (401, 403):
-            if self.api.session.auth:
-                msg = "Failed request to `{}`. Cannot authenticate user `{}` on the API.".format(
-                    url, self.api.session.auth[0],
-                )
+    def _with_options(self, timeout=None, deadline=None, fields=None):
+        if deadline is None and self._deadline_at is None:
+            deadline = self.get_deadline()
+        if timeout is None and deadline is None and fields is None:
+            return self
+        endpoint = copy.copy(self)
+        if timeout is not None:
+            endpoint.timeout = timeout
+        if deadline is not None:
+            endpoint._deadline_at = time.time() + deadline
+        if fields is not None:
+            if isinstance(fields, type('')):
+                fields = fields.split(',')
+            fields = tuple(fields)
+            if self.fields_pk is not None and self.fields_pk not in fields:
+                # Partial resources are saved and deleted by their primary key.
+                fields += (self.fields_pk,)
+            endpoint._fields = fields
+            # Unlike ``_fields``, kept once the call is over: its resources are partial.
+            endpoint._partial = True
+        return endpoint
+
+    @contextlib.contextmanager
+    def _call(self, name, **options):
+        endpoint = self._with_options(**options)
+        tracer = self.api._tracer
+        try:
+            if tracer is None or endpoint._trace_context is not None:
+                yield endpoint
             else:
-                msg = "Failed request to `{}`. User is not authenticated.".format(
-                    url,
-                )
+                if endpoint is self:
+                    endpoint = copy.copy(self)
+                with tracer.call(name, endpoint):
+                    yield endpoint
+        finally:
+            endpoint._end_call(self)
+
+    def _end_call(self, endpoint):
+        # Resources keep a reference to the endpoint, their own requests get a deadline of their own.
+        if self is not endpoint:
+            self._deadline_at = None
+            self._fields = None
+            self._trace_context = None
+
+    def get_timeout(self):
+        return self.timeout if self.timeout is not None else self.api._timeout
+
+    def get_deadline(self):
+        return self.deadline if self.deadline is not None else self.api._deadline
+
+    def cap_timeout(self, timeout, deadline_at):
+        if deadline_at is None:
+            return timeout
+        remaining = deadline_at - time.time()
+        if remaining <= 0:
+            raise exceptions.DeadlineExceeded("Deadline exceeded on `{}`".format(self.name))
+        if isinstance(timeout, tuple):
+            return tuple(remaining if value is None else min(value, remaining) for value in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
 
-            raise exceptions.NotAuthenticatedError(
-                response, msg,
+    def fields_params(self, url, params):
+        if self._fields is None or self.fields_param is None:
+            return params
+        name = self.fields_param.format(name=self.name)
+        # Next pages' links usually carry it already.
+        if name in parse_qs(urlparse(url).query):
+            return params
+        params = dict(params or {})
+        params.setdefault(name, self.fields_separator.join(self._fields))
+        return params
+
+    def route_for(self, url):
+        if url.split('?')[0].rstrip('/') == self.url.rstrip('/'):
+            return self.name
+        return '{}/{{pk}}'.format(self.name)
+
+    def iter_pages(self, params, limit=None):
+        if limit is not None and self.page_size_param is not None:
+            params.setdefault(self.page_size_param, limit)
+        pages = pagination.iter_pages(self.api.autopaginate, self, params, limit)
+        if self.api._tracer is not None:
+            pages = self.api._tracer.pages(self._trace_context, self.name, pages)
+        if self.api._hooks:
+            pages = self._observe_pages(pages)
+        return pages
+
+    def _observe_pages(self, pages):
+        started = time.time()
+        count = items = 0
+        for response, results in pages:
+            count += 1
+            items += len(results)
+            self.api._emit(
+                'on_page', endpoint=self.name, route=self.name, response=response, results=results, page=count,
             )
-        elif response.status_code == 400:
-            raise exceptions.BadRequestError(
+            yield response, results
+        self.api._emit(
+            'after_pages', endpoint=self.name, route=self.name, pages=count, items=items, elapsed=time.time() - started,
+        )
+
+    def project(self, results):
+        if self._fields is None or not self.trim_fields:
+            return results
+        return utils.project(results, self._fields)
+
+    @call_options
+    def filter(self, _as=None, _limit=None, **kwargs):
+        if _as is not None:
+            return self.filter_columns(_as, _limit=_limit, **kwargs)
+
+        response = None
+        pages = []
+        for response, results in self.iter_pages(kwargs.copy(), _limit):
+            pages.append(self.project(results))
+        results = pages[0] if len(pages) == 1 else [result for page in pages for result in page]
+        return self.resource_set_class.from_results(self, response, results)
+
+    @call_options
+    def all(self, _as=None, _limit=None):
+        return self.filter(_as=_as, _limit=_limit)
+
+    def query(self, **kwargs):
+        return Query(self, kwargs)
+
+    @call_options
+    def filter_columns(self, format='columns', _limit=None, **kwargs):
+        columns.check_format(format)
+        builder = columns.ColumnBuilder()
+        response = None
+        pages = self.iter_pages(kwargs.copy(), _limit)
+        for response, results in pagination.prefetch(pages):
+            builder.extend(self.project(results))
+        return builder.build(format, response)
+
+    @call_options
+    def get(self, **kwargs):
+        try:
+            utils.find_pk(kwargs)
+        except exceptions.UnknownPK:
+            resource = self._get_by_query(kwargs)
+        else:
+            resource = super(Endpoint, self).get(**kwargs)
+        if self._fields is not None and self.trim_fields:
+            resource.payload = utils.project(resource.payload, self._fields)
+        if self._partial:
+            resource._track_changes()
+        return resource
+
+    def _get_by_query(self, params):
+        # Two results are enough to know there are too many.
+        response, found = None, []
+        for response, results in self.iter_pages(params.copy(), 2):
+            if response.status_code == 404:
+                break
+            if isinstance(results, dict):
+                return self.resource_class(self, response, **results)
+            found += results
+        if not found:
+            raise exceptions.ResourceNotFound("No `{}` found for {}".format(self.name, params))
+        if len(found) > 1:
+            raise exceptions.MultipleResourcesFound("Found more than one `{}` for {}".format(self.name, params))
+        return self.resource_class(self, response, **found[0])
+
+    create = call_options(BaseEndpoint.create)
+    get_or_create = call_options(BaseEndpoint.get_or_create)
+    create_or_update = call_options(BaseEndpoint.create_or_update)
+    delete = call_options(BaseEndpoint.delete)
+
+    @call_options
+    def iter_filter(self, _limit=None, **kwargs):
+        if self._can_stream():
+            params = kwargs.copy()
+            if _limit is not None and self.page_size_param is not None:
+                params.setdefault(self.page_size_param, _limit)
+            # A single page: resources are wrapped as its items are decoded from the socket.
+            results = self.request('get', self.url, params=params, _lazy=True).data
+            try:
+                for result in itertools.islice(results, _limit):
+                    yield self.resource_class.wrap(self, self.project(result))
+            finally:
+                if hasattr(results, 'close'):
+                    results.close()
+            return
+        pages = self.iter_pages(kwargs.copy(), _limit)
+        for response, results in pagination.prefetch(pages):
+            for result in self.project(results):
+                yield self.resource_class.wrap(self, result)
+
+    def iter_all(self, **kwargs):
+        return self.iter_filter(**kwargs)
+
+    def _can_stream(self):
+        # Caches, hooks and so on need each page whole.
+        api = self.api
+        return (
+            api._stream_json and api.autopaginate is None and api._cache is None and api._single_flight is None
+            and api._tracer is None and not api._hooks
+        )
+
+    @call_options
+    def export(self, sink, **kwargs):
+        endpoint = copy.copy(self)
+        endpoint._record_requests = True
+        params = kwargs.copy()
+        checkpoint = sink.open(cache.cache_key(self.url, params))
+        try:
+            if checkpoint is not None:
+                if checkpoint.done:
+                    return checkpoint.items
+                # Request the last page stored again, for the paginator to carry on from there.
+                parts = urlparse(checkpoint.url)
+                endpoint.url = urlunparse(parts._replace(query=''))
+                params = dict(parse_qsl(parts.query, keep_blank_values=True))
+            pages = pagination.prefetch(endpoint.iter_pages(params))
+            with contextlib.closing(pages):
+                for response, results in pages:
+                    if response.status_code >= 400:
+                        raise exceptions.HTTPError(
+                            response, "Failed to export `{}`: status {}".format(self.name, response.status_code),
+                        )
+                    url = getattr(response, 'request_url', None)
+                    if checkpoint is not None:
+                        if utils.sorted_query(url) != utils.sorted_query(checkpoint.url):
+                            raise ValueError(
+                                "Can't resume the export of `{}` from `{}`, requested `{}` instead.".format(
+                                    self.name, checkpoint.url, url,
+                                ),
+                            )
+                        checkpoint = None
+                        continue
+                    sink.write(endpoint.project(results), url)
+            sink.finish()
+            return sink.checkpoint.items
+        finally:
+            sink.close()
+
+    @call_options
+    def get_many(self, lookups, max_workers=8):
+        return bulk.fan_out(lambda lookup: self.get(**lookup), lookups, max_workers)
+
+    @call_options
+    def create_many(self, payloads, max_workers=8):
+        if self.bulk_url is None:
+            return bulk.fan_out(self.create, payloads, max_workers)
+
+        results = []
+        chunks = bulk.chunked(payloads, self.bulk_chunk_size)
+        for outcome in bulk.fan_out(self._create_chunk, chunks, max_workers):
+            if outcome.ok:
+                results += [
+                    bulk.BulkResult(payload, value=resource)
+                    for payload, resource in zip(outcome.item, outcome.value)
+                ]
+            else:
+                results += [bulk.BulkResult(payload, exception=outcome.exception) for payload in outcome.item]
+        return results
+
+    def _create_chunk(self, payloads):
+        url = self._urljoin(self.bulk_url)
+        response = self.request('post', url, json=payloads, _route='{}/{}'.format(self.name, self.bulk_url))
+        if response.status_code not in (200, 201):
+            raise exceptions.HTTPError(response)
+        if not isinstance(response.data, list) or len(response.data) != len(payloads):
+            raise exceptions.HTTPError(
                 response,
-                "Bad Request 400: {}".format(response.data)
+                "Expected a list of {} `{}` from `{}`".format(len(payloads), self.name, self.bulk_url),
+            )
+        return [self.resource_class(self, response, **result) for result in response.data]
+
+    @call_options
+    def delete_many(self, pks, max_workers=8):
+        return bulk.fan_out(self.delete, pks, max_workers)
+
+    def request(self, method, url, *args, **kwargs):
+        if self.api._tracer is not None and self._trace_context is None:
+            # Routes, and resources' ``.save()`` and ``.delete()``.
+            with self._call(kwargs.get('_route') or '{}.{}'.format(self.name, method.lower())) as endpoint:
+                return endpoint.request(method, url, *args, **kwargs)
+        if self._fields is not None and method.lower() == 'get':
+            kwargs['params'] = self.fields_params(url, kwargs.get('params'))
+        single_flight = self.api._single_flight
+        if single_flight is not None and method.lower() == 'get' and not args and 'headers' not in kwargs:
+            key = cache.cache_key(url, kwargs.get('params'))
+            response = single_flight.do(key, lambda: self.cached_request(method, url, **kwargs))
+            # Shared by all the callers: each one gets its own copy of the data.
+            response = ParsedResponse(
+                status_code=response.status_code, headers=response.headers, data=copy.deepcopy(response.data),
             )
+        else:
+            response = self.cached_request(method, url, *args, **kwargs)
+            if single_flight is not None and method.lower() in ('post', 'put', 'patch', 'delete'):
+                single_flight.forget(cache.cache_key(url))
+        if self._record_requests:
+            # Exports checkpoint the pages by the URL they were requested with.
+            response.request_url = cache.cache_key(url, kwargs.get('params'))
+        return response
+
+    def cached_request(self, method, url, *args, **kwargs):
+        if self.api._cache is None:
+            return self.send(method, url, *args, **kwargs)
+        if method.lower() == 'get' and not args:
+            return self._cached_get(url, **kwargs)
+        response = self.send(method, url, *args, **kwargs)
+        if method.lower() in ('post', 'put', 'patch', 'delete'):
+            self.api._cache.delete(cache.cache_key(url))
+        return response
+
+    def _cached_get(self, url, **kwargs):
+        key = cache.cache_key(url, kwargs.get('params'))
+        entry = self.api._cache.get(key)
+        if entry is not None:
+            if entry.fresh:
+                return entry.to_response(self.api._json_backend.loads)
+            kwargs['headers'] = CaseInsensitiveDict(kwargs.get('headers') or {})
+            for header, value in entry.validators().items():
+                kwargs['headers'].setdefault(header, value)
+
+        # The whole body is kept for the cache, even with ``stream_json``.
+        kwargs['stream'] = False
+        response, resp = self._send('get', url, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            revalidated = self.api._cache.make_entry(response, previous=entry)
+            if revalidated is None:
+                self.api._cache.delete(key)
+                return entry.to_response(self.api._json_backend.loads)
+            self.api._cache.set(key, revalidated)
+            return revalidated.to_response(self.api._json_backend.loads)
+
+        if response.status_code == 200:
+            entry = self.api._cache.make_entry(response, utils.utf8_content(resp))
+            if entry is not None:
+                self.api._cache.set(key, entry)
+            else:
+                self.api._cache.delete(key)
         return response
 
+    def send(self, method, url, *args, **kwargs):
+        return self._send(method, url, *args, **kwargs)[0]
+
+    def _send(self, method, url, *args, **kwargs):
+        # Returns the parsed response, and the ``requests`` one it was built from.
+        lazy = kwargs.pop('_lazy', False)
+        if self.api._stream_json:
+            kwargs.setdefault('stream', True)
+        if kwargs.get('json') is not None:
+            kwargs['data'] = self.api._json_backend.encode(kwargs.pop('json'))
+            kwargs['headers'] = CaseInsensitiveDict(kwargs.get('headers') or {})
+            kwargs['headers'].setdefault('Content-Type', 'application/json')
+        if self.api._compress_min_size is not None and kwargs.get('data') is not None:
+            self.api._compress_request(kwargs)
+        route = kwargs.pop('_route', None) or self.route_for(url)
+        if self.api._hooks:
+            self.api._emit('before_request', endpoint=self.name, route=route, method=method, url=url, kwargs=kwargs)
+        started = time.time()
+        resp = self.send_with_retry(method, url, *args, _route=route, **kwargs)
+        received = time.time()
+        if self.api._tracer is None:
+            data = self.api.hydrate_data(resp, lazy)
+        else:
+            with self.api._tracer.decode(self._trace_context, route) as span:
+                data = self.api.hydrate_data(resp)
+                span.set_attribute('http.response.body.size', utils.bytes_received(resp))
+        response = ParsedResponse(status_code=resp.status_code, headers=resp.headers, data=data)
+        if self.api._hooks:
+            decoded = time.time()
+            self.api._emit(
+                'after_response', endpoint=self.name, route=route, method=method, url=url, response=response,
+                elapsed=decoded - started, timings={
+                    'wait': resp.elapsed.total_seconds(),
+                    'request': received - started,
+                    'decode': decoded - received,
+                },
+                bytes_in=utils.bytes_received(resp), bytes_out=len(kwargs.get('data') or b''),
+            )
+        utils.check_response(response, url, self.api.session.auth)
+        return response, resp
+
+    def send_with_retry(self, method, url, *args, **kwargs):
+        route = kwargs.pop('_route', None)
+        timeout = kwargs.pop('timeout', None)
+        if timeout is None:
+            timeout = self.get_timeout()
+        started = time.time()
+        deadline_at = self._deadline_at
+        if deadline_at is None and self.get_deadline() is not None:
+            deadline_at = started + self.get_deadline()
+
+        retry = self.api._retry
+        if retry is None:
+            kwargs['timeout'] = self.cap_timeout(timeout, deadline_at)
+            return self.send_attempt(method, url, route, 1, *args, **kwargs)
+
+        attempt = 1
+        while True:
+            resp = exception = None
+            kwargs['timeout'] = self.cap_timeout(timeout, deadline_at)
+            try:
+                resp = self.send_attempt(method, url, route, attempt, *args, **kwargs)
+            except Exception as e:
+                exception = e
+                delay = retry.get_delay(method, attempt, started, exception=e)
+                if delay is None or self._past(deadline_at, delay):
+                    raise
+            else:
+                delay = retry.get_delay(method, attempt, started, response=resp)
+                if delay is None or self._past(deadline_at, delay):
+                    return resp
+                resp.close()
+            retry.record(method, url, attempt, delay, response=resp, exception=exception)
+            self.api._emit(
+                'on_retry', endpoint=self.name, route=route or self.route_for(url), method=method, url=url,
+                attempt=attempt, delay=delay, response=resp, exception=exception,
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def _past(self, deadline_at, delay):
+        return deadline_at is not None and time.time() + delay >= deadline_at
+
+    def send_attempt(self, method, url, route, attempt, *args, **kwargs):
+        tracer = self.api._tracer
+        if tracer is None:
+            return self.send_once(method, url, *args, **kwargs)
+        route = route or self.route_for(url)
+        with tracer.request(self._trace_context, method, url, route, attempt, kwargs) as span:
+            resp = self.send_once(method, url, *args, **kwargs)
+            tracer.response(span, resp.status_code)
+        return resp
+
+    def send_once(self, method, url, *args, **kwargs):
+        limiters = self.api._get_rate_limiters(self.name)
+        if not limiters:
+            return getattr(self.api.session, method)(url, *args, **kwargs)
+
+        acquired = []
+        resp = None
+        try:
+            for limiter in limiters:
+                limiter.acquire()
+                acquired.append(limiter)
+            resp = getattr(self.api.session, method)(url, *args, **kwargs)
+        finally:
+            if resp is not None and kwargs.get('stream'):
+                # The body is still to be downloaded: the request is in flight until the response is closed.
+                ratelimit.release_on_close(resp, acquired)
+            else:
+                for limiter in reversed(acquired):
+                    limiter.release()
+        for limiter in limiters:
+            limiter.update(resp.status_code, resp.headers)
+        return resp
+
 
 class GenericClient(BaseGenericClient):
     endpoint_class = Endpoint
 
-    def __init__(self, url, auth=None, session=None, adapter=None, trailing_slash=False, autopaginate=None):
+    DeadlineExceeded = exceptions.DeadlineExceeded
+
+    _stream_chunk_size = 64 * 1024
+
+    def __init__(self, url, auth=None, session=None, adapter=None, trailing_slash=False, autopaginate=None,
+                 stream_json=False, json_backend=None, pool_connections=DEFAULT_POOLSIZE,
+                 pool_maxsize=DEFAULT_POOLSIZE, pool_block=DEFAULT_POOLBLOCK, keep_alive=True, tcp_nodelay=True,
+                 tcp_keepalive=False, socket_options=None, thread_safe=False, cache=None, coalesce=False,
+                 coalesce_ttl=0, retry=None, rate_limit=None, endpoint_rate_limits=None, timeout=None,
+                 deadline=None, compression=True, compress_min_size=None, compress_encoding='gzip', hooks=None,
+                 metrics=None, tracing=False):
+        if thread_safe and session is not None:
+            raise ValueError("`session` can't be shared by threads when `thread_safe` is set.")
         super(GenericClient, self).__init__(url, auth, session, trailing_slash, autopaginate)
         self.adapter = adapter
+        self._stream_json = stream_json
+        self._json_backend = json_backends.get_backend(json_backend)
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._keep_alive = keep_alive
+        self._socket_options = adapters.make_socket_options(tcp_nodelay, tcp_keepalive, socket_options)
+        self._thread_safe = thread_safe
+        self._cache = cache
+        self._single_flight = singleflight.SingleFlight(coalesce_ttl) if coalesce else None
+        if isinstance(retry, int) and not isinstance(retry, bool):
+            retry = Retry(max_attempts=retry)
+        self._retry = retry
+        self._rate_limit = rate_limit
+        self._endpoint_rate_limits = endpoint_rate_limits or {}
+        self._timeout = timeout
+        self._deadline = deadline
+        if compress_min_size is not None:
+            check_encoding(compress_encoding)
+        self._compression = compression
+        self._compress_min_size = compress_min_size
+        self._compress_encoding = compress_encoding
+        self._hooks = {}
+        for event, event_hooks in (hooks or {}).items():
+            if callable(event_hooks):
+                event_hooks = [event_hooks]
+            for hook in event_hooks:
+                self.register_hook(event, hook)
+        self._metrics = metrics
+        if tracing is True:
+            self._tracer = Tracer()
+        elif tracing:
+            self._tracer = Tracer(tracing)
+        else:
+            self._tracer = None
+        if metrics is not None:
+            for event, hook in metrics.hooks().items():
+                self.register_hook(event, hook)
+        self._adapter = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._endpoints = {}
+
+    def _make_adapter(self):
+        if isinstance(self.adapter, BaseAdapter):
+            return self.adapter
+        if self.adapter is not None:
+            return self.adapter()
+        return adapters.PooledAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=self._pool_block,
+            socket_options=self._socket_options,
+        )
+
+    def _get_or_create_adapter(self):
+        if self._adapter is None:
+            with self._lock:
+                if self._adapter is None:
+                    self._adapter = self._make_adapter()
+        return self._adapter
+
+    def register_hook(self, event, hook):
+        if event not in HOOKS:
+            raise ValueError("Unknown event `{}`, expected one of {}.".format(event, ', '.join(HOOKS)))
+        self._hooks.setdefault(event, []).append(hook)
+
+    def _emit(self, event, **kwargs):
+        for hook in self._hooks.get(event, ()):
+            hook(**kwargs)
+
+    def _get_rate_limiters(self, name):
+        # The endpoint's own limiter first, so that waiting on it doesn't hold a slot of the global one.
+        limiters = []
+        if name in self._endpoint_rate_limits:
+            limiters.append(self._endpoint_rate_limits[name])
+        if self._rate_limit is not None:
+            limiters.append(self._rate_limit)
+        return limiters
+
+    def _get_endpoint(self, name):
+        # Endpoints are built once per name: calls with options work on copies of them.
+        endpoints = self.__dict__.get('_endpoints')
+        if endpoints is None:
+            return super(GenericClient, self).__getitem__(name)
+        endpoint = endpoints.get(name)
+        if endpoint is None:
+            endpoint = endpoints.setdefault(name, super(GenericClient, self).__getitem__(name))
+        return endpoint
+
+    def __getattr__(self, name):
+        return self._get_endpoint(name)
+
+    def __getitem__(self, item):
+        return self._get_endpoint(item)
+
+    def batch(self, max_workers=8):
+        return batch.Batch(self, max_workers)
+
+    def get_or_create_session(self):
+        if not self._thread_safe:
+            return super(GenericClient, self).get_or_create_session()
+        # One session per thread, all sharing the same adapter and pool of connections.
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self.make_session()
+        return session
 
     def make_session(self):
         session = requests.session()
         if self.auth is not None:
             session.auth = self.auth
         session.headers.update({'Content-Type': 'application/json'})
+        if not self._keep_alive:
+            session.headers['Connection'] = 'close'
+        session.headers['Accept-Encoding'] = accept_encoding(self._compression)
+        adapter = self._get_or_create_adapter()
         if self.adapter is not None:
-            session.mount(self.url, self.adapter())
+            session.mount(self.url, adapter)
+        else:
+            for prefix in ('https://', 'http://'):
+                session.mount(prefix, adapter)
         return session
 
-    def hydrate_data(self, response):
-        if not response.text:
+    def _compress_request(self, kwargs):
+        data = kwargs['data']
+        if isinstance(data, type(u'')):
+            data = data.encode('utf-8')
+        if not isinstance(data, bytes) or len(data) < self._compress_min_size:
+            return
+        headers = CaseInsensitiveDict(kwargs.get('headers') or {})
+        if 'Content-Encoding' in headers:
+            return
+        headers['Content-Encoding'] = self._compress_encoding
+        kwargs['headers'] = headers
+        kwargs['data'] = compress(data, self._compress_encoding)
+
+    def hydrate_data(self, response, lazy=False):
+        if self._stream_json:
+            # Lazily decoded arrays are only handed out for successful responses.
+            return self._hydrate_stream(response, lazy and response.ok)
+        if not response.content:
             return None
         try:
-            return response.json()
+            if utils.is_utf8(response.encoding):
+                # Skip decoding the body to ``str``: every backend parses UTF-8 bytes.
+                return self._json_backend.loads(response.content)
+            return self._json_backend.loads(response.text)
         except ValueError:
-            raise ValueError(
+            raise self._invalid_json(response, response.text)
+
+    def _hydrate_stream(self, response, lazy=False):
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+        chunks = (decoder.decode(chunk) for chunk in response.iter_content(self._stream_chunk_size))
+        stream = utils.JSONStream(chunks)
+        array = False
+        try:
+            char = stream.peek()
+            if char is None:
+                return None
+            if char != '[':
+                return self._json_backend.loads(stream.text())
+            array = True
+        except ValueError as e:
+            raise self._invalid_json(response, stream.text(), getattr(e, 'pos', None), stream.offset)
+        finally:
+            if not array:
+                response.close()
+        items = self._iter_stream(response, stream)
+        return items if lazy else list(items)
+
+    def _iter_stream(self, response, stream):
+        try:
+            for item in stream.iter_items():
+                yield item
+        except ValueError:
+            raise self._invalid_json(response, stream.buffer, stream.pos, stream.offset)
+        finally:
+            response.close()
+
+    def _invalid_json(self, response, text, pos=None, offset=0):
+        if pos is None:
+            return ValueError(
                 "Response from server is not valid JSON. Received {}: {}".format(
                     response.status_code,
-                    response.text,
+                    text,
                 ),
             )
+        return ValueError(
+            "Response from server is not valid JSON. Received {}, invalid at offset {}: {}".format(
+                response.status_code,
+                offset + pos,
+                utils.excerpt(text, pos),
+            ),
+        )
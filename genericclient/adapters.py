@@ -0,0 +1,41 @@
+import socket
+
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, DEFAULT_RETRIES, HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+def make_socket_options(tcp_nodelay=True, tcp_keepalive=False, socket_options=None):
+    options = [
+        option for option in HTTPConnection.default_socket_options
+        if option[:2] != (socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    ]
+    if tcp_nodelay:
+        options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+    if tcp_keepalive:
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    options += list(socket_options or [])
+    return options
+
+
+class PooledAdapter(HTTPAdapter):
+    """An ``HTTPAdapter`` that also sets the options of the sockets it opens.
+
+    An instance can be passed to several ``GenericClient`` as ``adapter``
+    for them to share the same pool of connections.
+    """
+    __attrs__ = HTTPAdapter.__attrs__ + ['socket_options']
+
+    def __init__(self, pool_connections=DEFAULT_POOLSIZE, pool_maxsize=DEFAULT_POOLSIZE,
+                 max_retries=DEFAULT_RETRIES, pool_block=DEFAULT_POOLBLOCK, socket_options=None):
+        if socket_options is None:
+            socket_options = make_socket_options()
+        self.socket_options = socket_options
+        super(PooledAdapter, self).__init__(pool_connections, pool_maxsize, max_retries, pool_block)
+
+    def init_poolmanager(self, connections, maxsize, block=DEFAULT_POOLBLOCK, **pool_kwargs):
+        pool_kwargs.setdefault('socket_options', self.socket_options)
+        super(PooledAdapter, self).init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs.setdefault('socket_options', self.socket_options)
+        return super(PooledAdapter, self).proxy_manager_for(proxy, **proxy_kwargs)
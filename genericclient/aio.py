@@ -0,0 +1,298 @@
+import asyncio
+import base64
+import inspect
+
+import aiohttp
+from requests.structures import CaseInsensitiveDict
+
+from genericclient_base import (
+    BaseEndpoint, BaseGenericClient, BaseResource, exceptions, ParsedResponse
+)
+
+from . import json_backends, pagination, routes, utils
+
+
+def encode_params(params):
+    # ``aiohttp`` only takes strings and numbers: encode them like ``requests`` does.
+    if not params:
+        return None
+    encoded = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is None:
+                continue
+            if not isinstance(item, (str, int, float)) or isinstance(item, bool):
+                item = str(item)
+            encoded.append((key, item))
+    return encoded
+
+
+def basic_auth(auth):
+    if hasattr(auth, 'encode'):
+        # ``aiohttp.BasicAuth``
+        return auth.encode()
+    username, password = auth
+    credentials = '{}:{}'.format(username, password).encode('latin1')
+    return 'Basic {}'.format(base64.b64encode(credentials).decode('ascii'))
+
+
+async def iter_link_header(endpoint, params):
+    lookup = params.copy()
+    url = endpoint.url
+
+    while True:
+        response = await endpoint.request('get', url, params=lookup)
+        yield response, response.data
+        link = response.links.get('next')
+        if link is None:
+            break
+        lookup = {}
+        url = link['url']
+
+
+async def link_header(endpoint, params):
+    results = []
+    async for response, data in iter_link_header(endpoint, params):
+        results += data
+    return response, results
+
+
+def is_async_paginator(paginator):
+    if hasattr(paginator, 'iter_pages'):
+        return inspect.isasyncgenfunction(paginator.iter_pages)
+    return inspect.iscoroutinefunction(paginator) or inspect.iscoroutinefunction(getattr(paginator, '__call__', None))
+
+
+async def _single_page(coro):
+    response, results = await coro
+    yield response, results
+
+
+def iter_pages(paginator, endpoint, params):
+    if paginator is None:
+        return _single_page(_request_page(endpoint, params))
+    if hasattr(paginator, 'iter_pages'):
+        return paginator.iter_pages(endpoint, params)
+    if paginator is link_header:
+        return iter_link_header(endpoint, params)
+    return _single_page(paginator(endpoint, params))
+
+
+async def _request_page(endpoint, params):
+    response = await endpoint.request('get', endpoint.url, params=params)
+    return response, response.data
+
+
+async def prefetch(pages):
+    task = asyncio.ensure_future(pages.__anext__())
+    try:
+        while True:
+            try:
+                page = await task
+            except StopAsyncIteration:
+                break
+            task = asyncio.ensure_future(pages.__anext__())
+            yield page
+            del page
+    finally:
+        if task.cancel():
+            try:
+                await task
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+        await pages.aclose()
+
+
+class AsyncResource(BaseResource):
+
+    async def save(self):
+        if self.pk is not None:
+            url = self._urljoin(self.pk)
+            try:
+                response = await self._endpoint.request('put', url, json=self.payload)
+            except exceptions.BadRequestError:
+                response = await self._endpoint.request('patch', url, json=self.payload)
+        else:
+            response = await self._endpoint.request('post', self._endpoint.url, json=self.payload)
+        self.payload = response.data
+        return self
+
+    async def delete(self):
+        url = self._urljoin(self.pk)
+        await self._endpoint.request('delete', url)
+
+
+class AsyncEndpoint(BaseEndpoint):
+    resource_class = AsyncResource
+    detail_route_class = routes.DetailRoute
+    list_route_class = routes.ListRoute
+
+    async def filter(self, **kwargs):
+        response = None
+        pages = []
+        async for response, results in iter_pages(self.api.autopaginate, self, kwargs.copy()):
+            pages.append(results)
+        results = pages[0] if len(pages) == 1 else [result for page in pages for result in page]
+        return self.resource_set_class(response, [self.resource_class(self, **result) for result in results])
+
+    async def all(self):
+        return await self.filter()
+
+    async def iter_filter(self, **kwargs):
+        pages = iter_pages(self.api.autopaginate, self, kwargs.copy())
+        async for response, results in prefetch(pages):
+            for result in results:
+                yield self.resource_class(self, **result)
+
+    def iter_all(self):
+        return self.iter_filter()
+
+    async def get(self, **kwargs):
+        try:
+            pk = utils.find_pk(kwargs)
+            url = self._urljoin(pk)
+            response = await self.request('get', url)
+        except exceptions.UnknownPK:
+            url = self.url
+            response = await self.request('get', url, params=kwargs)
+
+        if response.status_code == 404:
+            raise exceptions.ResourceNotFound("No `{}` found for {}".format(self.name, kwargs))
+
+        result = response.data
+
+        if isinstance(result, list):
+            if len(result) == 0:
+                raise exceptions.ResourceNotFound("No `{}` found for {}".format(self.name, kwargs))
+            if len(result) > 1:
+                raise exceptions.MultipleResourcesFound("Found {} `{}` for {}".format(len(result), self.name, kwargs))
+
+            return self.resource_class(self, response, **result[0])
+
+        return self.resource_class(self, response, **result)
+
+    async def create(self, payload):
+        response = await self.request('post', self.url, json=payload)
+        if response.status_code != 201:
+            raise exceptions.HTTPError(response)
+
+        return self.resource_class(self, response, **response.data)
+
+    async def get_or_create(self, **kwargs):
+        defaults = kwargs.pop('defaults', {})
+        try:
+            return await self.get(**kwargs)
+        except exceptions.ResourceNotFound:
+            params = {k: v for k, v in kwargs.items()}
+            params.update(defaults)
+            return await self.create(params)
+
+    async def create_or_update(self, payload):
+        if 'id' in payload or 'uuid' in payload:
+            return await self.resource_class(self, response=None, **payload).save()
+
+        return await self.create(payload)
+
+    async def delete(self, pk):
+        url = self._urljoin(pk)
+
+        response = await self.request('delete', url)
+
+        if response.status_code == 404:
+            raise exceptions.ResourceNotFound("No `{}` found for pk {}".format(self.name, pk))
+
+        if response.status_code != 204:
+            raise exceptions.HTTPError(response)
+
+        return None
+
+    async def request(self, method, url, params=None, json=None, _route=None, **kwargs):
+        session = await self.api.get_or_create_session()
+        if json is not None:
+            kwargs['data'] = self.api._json_backend.encode(json)
+            kwargs['headers'] = CaseInsensitiveDict(kwargs.get('headers') or {})
+            kwargs['headers'].setdefault('Content-Type', 'application/json')
+        async with session.request(method.upper(), url, params=encode_params(params), **kwargs) as resp:
+            content = await resp.read()
+            headers = CaseInsensitiveDict()
+            for key in resp.headers:
+                headers[key] = ', '.join(resp.headers.getall(key))
+            response = ParsedResponse(
+                status_code=resp.status,
+                headers=headers,
+                data=self.api.hydrate_data(resp, content),
+            )
+
+        utils.check_response(response, url, self.api.auth)
+        return response
+
+
+class AsyncGenericClient(BaseGenericClient):
+    endpoint_class = AsyncEndpoint
+
+    def __init__(self, url, auth=None, session=None, trailing_slash=False, autopaginate=None,
+                 json_backend=None, connector=None, limit=100, limit_per_host=0):
+        if autopaginate is pagination.link_header:
+            autopaginate = link_header
+        elif autopaginate is not None and not is_async_paginator(autopaginate):
+            raise ValueError(
+                "Can't paginate asynchronously with {!r}: use `genericclient.aio.link_header`, a coroutine function, "
+                "or an object with an async generator `iter_pages(endpoint, params)` method.".format(autopaginate),
+            )
+        super(AsyncGenericClient, self).__init__(url, auth, session, trailing_slash, autopaginate)
+        self._json_backend = json_backends.get_backend(json_backend)
+        self._connector = connector
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._owns_session = session is None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    def make_session(self):
+        headers = {'Content-Type': 'application/json'}
+        if self.auth is not None:
+            headers['Authorization'] = basic_auth(self.auth)
+        if self._connector is not None:
+            connector, owner = self._connector, False
+        else:
+            connector, owner = aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host), True
+        return aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=owner,
+            headers=headers,
+        )
+
+    async def get_or_create_session(self):
+        # ``aiohttp`` sessions must be created from within a running event loop.
+        if self._session is None:
+            self._session = self.make_session()
+        return self._session
+
+    @property
+    def session(self):
+        return self._session
+
+    def hydrate_data(self, response, content):
+        if not content:
+            return None
+        try:
+            if utils.is_utf8(response.charset):
+                return self._json_backend.loads(content)
+            return self._json_backend.loads(content.decode(response.charset))
+        except (ValueError, LookupError):
+            raise ValueError(
+                "Response from server is not valid JSON. Received {}: {}".format(
+                    response.status,
+                    content.decode(response.charset or 'utf-8', 'replace'),
+                ),
+            )
@@ -0,0 +1,134 @@
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+
+class BatchFuture(Future):
+    """A ``Future`` that starts the pending calls of its batch when its result is asked for."""
+
+    def __init__(self, batch):
+        super(BatchFuture, self).__init__()
+        self._batch = batch
+
+    def result(self, timeout=None):
+        self._batch.flush()
+        return super(BatchFuture, self).result(timeout)
+
+    def exception(self, timeout=None):
+        self._batch.flush()
+        return super(BatchFuture, self).exception(timeout)
+
+
+def _run(future, func, args, kwargs):
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as e:
+        future.set_exception(e)
+    else:
+        future.set_result(result)
+
+
+class Batch(object):
+    """Collect calls, then run them concurrently over ``max_workers`` threads.
+
+    Endpoints and routes accessed on the batch return a ``BatchFuture``
+    instead of a result. Pending calls start when the batch exits, is
+    flushed, or one of their results is asked for.
+    """
+
+    def __init__(self, api, max_workers=8):
+        if max_workers < 1:
+            raise ValueError("`max_workers` must be at least 1, got {!r}".format(max_workers))
+        self.api = api
+        self.max_workers = max_workers
+        self.futures = []
+        self._pending = []
+        self._executor = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<{0} calls={1} pending={2}>'.format(self.__class__.__name__, len(self.futures), len(self._pending))
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return BatchEndpoint(self, self.api[name])
+
+    def __getitem__(self, item):
+        return BatchEndpoint(self, self.api[item])
+
+    def submit(self, func, *args, **kwargs):
+        future = BatchFuture(self)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Can't add calls to a closed batch.")
+            self._pending.append((future, func, args, kwargs))
+            self.futures.append(future)
+        return future
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if pending and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            for future, func, args, kwargs in pending:
+                if future.set_running_or_notify_cancel():
+                    self._executor.submit(_run, future, func, args, kwargs)
+
+    def wait(self, timeout=None):
+        self.flush()
+        return wait(self.futures, timeout)
+
+    def close(self, cancel=False):
+        with self._lock:
+            self._closed = True
+        if cancel:
+            for future, _, _, _ in self._pending:
+                future.cancel()
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # On errors, only the calls already started are waited for.
+        self.close(cancel=exc_type is not None)
+
+
+class BatchEndpoint(object):
+
+    def __init__(self, batch, endpoint):
+        self._batch = batch
+        self._endpoint = endpoint
+
+    def __repr__(self):
+        return '<{0} `{1}`>'.format(self.__class__.__name__, self._endpoint.url)
+
+    def __call__(self, *args, **kwargs):
+        return BatchRoute(self._batch, self._endpoint(*args, **kwargs))
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self._endpoint, name)
+        if not callable(attr):
+            return attr
+        return functools.partial(self._batch.submit, attr)
+
+
+class BatchRoute(object):
+
+    def __init__(self, batch, route):
+        self._batch = batch
+        self._route = route
+
+    def __repr__(self):
+        return '<{0} {1!r}>'.format(self.__class__.__name__, self._route)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return functools.partial(self._batch.submit, getattr(self._route, name))
@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BulkResult(object):
+    """The outcome of one item of a bulk call: either a value or an exception."""
+    __slots__ = ('item', 'value', 'exception')
+
+    def __init__(self, item, value=None, exception=None):
+        self.item = item
+        self.value = value
+        self.exception = exception
+
+    @property
+    def ok(self):
+        return self.exception is None
+
+    def result(self):
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+    def __repr__(self):
+        if self.ok:
+            return '<{0} ok: {1!r}>'.format(self.__class__.__name__, self.value)
+        return '<{0} failed: {1!r}>'.format(self.__class__.__name__, self.exception)
+
+
+def _outcome(item, future):
+    try:
+        return BulkResult(item, value=future.result())
+    except Exception as e:
+        return BulkResult(item, exception=e)
+
+
+def fan_out(func, items, max_workers):
+    """Call ``func`` on each item over a pool of threads.
+
+    Returns a ``BulkResult`` for each item, in the same order as ``items``.
+    """
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        return [_outcome(item, future) for item, future in zip(items, futures)]
+
+
+def chunked(items, size):
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
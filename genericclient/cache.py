@@ -0,0 +1,247 @@
+import collections
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from requests import Request
+from requests.structures import CaseInsensitiveDict
+
+from genericclient_base import ParsedResponse
+
+
+_max_age_re = re.compile(r'max-age\s*=\s*"?(\d+)"?', re.IGNORECASE)
+
+
+def cache_key(url, params=None):
+    if params:
+        params = sorted(params.items())
+    return Request('GET', url, params=params).prepare().url
+
+
+def parse_cache_control(headers):
+    directives = set()
+    max_age = None
+    for directive in headers.get('Cache-Control', '').split(','):
+        directive = directive.strip().lower()
+        match = _max_age_re.match(directive)
+        if match:
+            max_age = int(match.group(1))
+        elif directive:
+            directives.add(directive)
+    return directives, max_age
+
+
+class CacheEntry(object):
+    """A cached response, holding its body as UTF-8 encoded JSON."""
+    __slots__ = ('status_code', 'headers', 'content', 'expires', 'size')
+
+    def __init__(self, status_code, headers, content, expires, size=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.expires = expires
+        self.size = len(content) if size is None else size
+
+    @property
+    def fresh(self):
+        return self.expires is not None and time.time() < self.expires
+
+    @property
+    def etag(self):
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self):
+        return self.headers.get('Last-Modified')
+
+    def validators(self):
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self, loads=json.loads):
+        # Decoding the body on each hit gives every caller data of its own to modify.
+        return ParsedResponse(
+            status_code=self.status_code,
+            headers=CaseInsensitiveDict(self.headers),
+            data=loads(self.content) if self.content else None,
+        )
+
+    def to_dict(self):
+        return {
+            'status_code': self.status_code,
+            'headers': dict(self.headers),
+            'content': self.content.decode('utf-8'),
+            'expires': self.expires,
+            'size': self.size,
+        }
+
+    @classmethod
+    def from_dict(cls, value):
+        value['headers'] = CaseInsensitiveDict(value['headers'])
+        value['content'] = value['content'].encode('utf-8')
+        return cls(**value)
+
+
+class BaseCache(object):
+    """Caches the responses of ``GET`` requests, honouring ``Cache-Control``.
+
+    Fresh entries (per ``max-age``) are served without any request. Stale
+    ones are revalidated with ``If-None-Match``/``If-Modified-Since``, and
+    reused when the server answers ``304 Not Modified``. Responses without
+    ``max-age`` expire after ``default_ttl`` seconds, if set, and are
+    otherwise only kept when they can be revalidated.
+
+    Entries are evicted, least recently used first, when there are more than
+    ``max_entries`` of them or their size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, default_ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def make_entry(self, response, content=b'', previous=None):
+        """Return a ``CacheEntry`` for ``response``, or ``None`` if it can't be cached.
+
+        ``content`` is the body of the response, as UTF-8 encoded JSON. When
+        revalidating ``previous``, its body is kept instead.
+        """
+        headers = CaseInsensitiveDict(previous.headers if previous is not None else {})
+        headers.update(response.headers)
+        directives, max_age = parse_cache_control(headers)
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            max_age = 0
+        elif max_age is None:
+            max_age = self.default_ttl
+        if max_age is None and 'ETag' not in headers and 'Last-Modified' not in headers:
+            return None
+        if previous is not None:
+            status_code, content = previous.status_code, previous.content
+        else:
+            status_code = response.status_code
+        return CacheEntry(status_code, headers, content, time.time() + (max_age or 0))
+
+
+class MemoryCache(BaseCache):
+
+    def __init__(self, max_entries=1024, max_bytes=None, default_ttl=None):
+        super(MemoryCache, self).__init__(max_entries, max_bytes, default_ttl)
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            self._entries[key] = entry
+            self.size += entry.size
+            while self._entries and (
+                    len(self._entries) > self.max_entries or
+                    (self.max_bytes is not None and self.size > self.max_bytes)):
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class SQLiteCache(BaseCache):
+
+    def __init__(self, path, max_entries=1024, max_bytes=None, default_ttl=None):
+        super(SQLiteCache, self).__init__(max_entries, max_bytes, default_ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS genericclient_cache '
+            '(key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM genericclient_cache').fetchone()[0]
+
+    @property
+    def size(self):
+        with self._lock:
+            return self._db.execute('SELECT COALESCE(SUM(size), 0) FROM genericclient_cache').fetchone()[0]
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute('SELECT value FROM genericclient_cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute('UPDATE genericclient_cache SET accessed = ? WHERE key = ?', (time.time(), key))
+        return CacheEntry.from_dict(json.loads(row[0]))
+
+    def set(self, key, entry):
+        value = json.dumps(entry.to_dict())
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO genericclient_cache (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                (key, value, entry.size, time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        while True:
+            count, size = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM genericclient_cache'
+            ).fetchone()
+            if count <= self.max_entries and (self.max_bytes is None or size <= self.max_bytes):
+                break
+            self._db.execute(
+                'DELETE FROM genericclient_cache WHERE key = '
+                '(SELECT key FROM genericclient_cache ORDER BY accessed, rowid LIMIT 1)'
+            )
+
+    def delete(self, key):
+        with self._lock:
+            self._db.execute('DELETE FROM genericclient_cache WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM genericclient_cache')
+
+    def close(self):
+        self._db.close()
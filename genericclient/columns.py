@@ -0,0 +1,59 @@
+import collections
+
+FORMATS = ('columns', 'numpy', 'arrow')
+
+
+class ColumnSet(collections.OrderedDict):
+    """Results as columns: a ``dict`` of lists (or arrays), by key.
+
+    Like a ``ResourceSet``, ``.response`` is the response of the last page.
+    """
+
+    def __init__(self, response, columns=()):
+        super(ColumnSet, self).__init__(columns)
+        self.response = response
+
+
+def check_format(format):
+    if format not in FORMATS:
+        raise ValueError("Unknown format `{}`, expected one of {}.".format(format, ', '.join(FORMATS)))
+
+
+class ColumnBuilder(object):
+    """Appends rows, page by page, to one list for each key.
+
+    A key missing from some rows gets ``None`` for them.
+    """
+
+    def __init__(self):
+        self.columns = collections.OrderedDict()
+        self.length = 0
+
+    def extend(self, rows):
+        if not isinstance(rows, list):
+            rows = list(rows)
+        if not rows:
+            return
+        for row in rows:
+            for key in row:
+                if key not in self.columns:
+                    self.columns[key] = [None] * self.length
+        for key, column in self.columns.items():
+            column.extend([row.get(key) for row in rows])
+        self.length += len(rows)
+
+    def build(self, format='columns', response=None):
+        check_format(format)
+        if format == 'columns':
+            return ColumnSet(response, self.columns)
+        if format == 'numpy':
+            import numpy
+            return ColumnSet(response, ((key, numpy.array(column)) for key, column in self.columns.items()))
+        import pyarrow
+        return pyarrow.table(self.columns)
+
+
+def to_columns(rows, format='columns', response=None):
+    builder = ColumnBuilder()
+    builder.extend(rows)
+    return builder.build(format, response)
@@ -0,0 +1,56 @@
+import zlib
+
+try:
+    from urllib3.util.request import ACCEPT_ENCODING
+except ImportError:
+    ACCEPT_ENCODING = 'gzip,deflate'
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def available_encodings():
+    # The codecs ``urllib3`` can decode responses with, depending on the packages installed.
+    return [encoding.strip() for encoding in ACCEPT_ENCODING.split(',')]
+
+
+def accept_encoding(compression=True):
+    if compression is True:
+        encodings = available_encodings()
+    elif not compression:
+        return 'identity'
+    else:
+        encodings = [encoding for encoding in compression if encoding in available_encodings()]
+    return ', '.join(encodings) or 'identity'
+
+
+def check_encoding(encoding):
+    if encoding not in ('gzip', 'deflate', 'br', 'zstd'):
+        raise ValueError("Unknown encoding `{}`.".format(encoding))
+    if encoding == 'br' and brotli is None:
+        raise ValueError("Compressing with `br` requires `brotli` to be installed.")
+    if encoding == 'zstd' and zstandard is None:
+        raise ValueError("Compressing with `zstd` requires `zstandard` to be installed.")
+
+
+def compress(data, encoding='gzip', level=6):
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if encoding == 'deflate':
+        return zlib.compress(data, level)
+    if encoding == 'br':
+        return brotli.compress(data)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor().compress(data)
+    check_encoding(encoding)
@@ -1 +1,7 @@
+from requests.exceptions import Timeout
+
 from genericclient_base.exceptions import *  # noqa
+
+
+class DeadlineExceeded(Timeout):
+    pass
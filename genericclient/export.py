@@ -0,0 +1,175 @@
+import io
+import json
+import os
+import sqlite3
+
+
+def replace_file(src, dst):
+    """Move ``src`` over ``dst``, atomically where the platform allows it."""
+    if hasattr(os, 'replace'):
+        return os.replace(src, dst)
+    # Python 2: rename() is atomic on POSIX, but refuses to overwrite on Windows.
+    if os.name == 'nt' and os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
+
+class Checkpoint(object):
+    """How far an export got: the URL of the last page stored, and the number of items stored."""
+    __slots__ = ('key', 'url', 'items', 'done')
+
+    def __init__(self, key, url=None, items=0, done=False):
+        self.key = key
+        self.url = url
+        self.items = items
+        self.done = done
+
+    def __repr__(self):
+        return '<{0} `{1}` items={2} done={3}>'.format(self.__class__.__name__, self.url, self.items, self.done)
+
+
+class BaseSink(object):
+    """Stores the items of an export page by page, along with a checkpoint.
+
+    ``open(key)`` returns the checkpoint left by a previous export of the
+    same ``key``, if any. Each ``write(results, url)`` must store the items
+    and the new checkpoint at once, so that a crash never leaves items the
+    checkpoint doesn't account for.
+    """
+    checkpoint = None
+
+    def open(self, key):
+        raise NotImplementedError
+
+    def write(self, results, url):
+        raise NotImplementedError
+
+    def finish(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def check_key(self, checkpoint, key):
+        if checkpoint is not None and checkpoint.key != key:
+            raise ValueError("The checkpoint is for an export of `{}`, not `{}`.".format(checkpoint.key, key))
+        return checkpoint
+
+
+class JSONLinesSink(BaseSink):
+    """Write items to ``path``, one JSON document per line.
+
+    The checkpoint is kept in ``checkpoint_path`` (``path`` + ``.checkpoint``)
+    with the size of the file at that point: items written after it are
+    truncated when resuming.
+    """
+
+    def __init__(self, path, checkpoint_path=None, fsync=True):
+        self.path = path
+        self.checkpoint_path = checkpoint_path or path + '.checkpoint'
+        self.fsync = fsync
+        self._file = None
+        self._size = 0
+
+    def open(self, key):
+        checkpoint = None
+        if os.path.exists(self.checkpoint_path):
+            with io.open(self.checkpoint_path, encoding='utf-8') as f:
+                value = json.load(f)
+            self._size = value.pop('size')
+            checkpoint = self.check_key(Checkpoint(**value), key)
+            if not os.path.exists(self.path) or os.path.getsize(self.path) < self._size:
+                raise ValueError("`{}` is missing items of its checkpoint.".format(self.path))
+        self.checkpoint = checkpoint or Checkpoint(key)
+        self._file = io.open(self.path, 'ab' if checkpoint is not None else 'wb')
+        self._file.truncate(self._size)
+        self._file.seek(self._size)
+        return checkpoint
+
+    def write(self, results, url):
+        data = b''.join(json.dumps(result).encode('utf-8') + b'\n' for result in results)
+        self._file.write(data)
+        self._size += len(data)
+        self.checkpoint.url = url
+        self.checkpoint.items += len(results)
+        self._save()
+
+    def finish(self):
+        self.checkpoint.done = True
+        self._save()
+
+    def _save(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        value = {name: getattr(self.checkpoint, name) for name in Checkpoint.__slots__}
+        value['size'] = self._size
+        path = self.checkpoint_path + '.tmp'
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(value))
+        replace_file(path, self.checkpoint_path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SQLiteSink(BaseSink):
+    """Insert items as JSON in ``table`` of the SQLite database at ``path``.
+
+    Each page is inserted in the same transaction as the checkpoint, kept
+    in ``genericclient_checkpoints`` by table.
+    """
+
+    def __init__(self, path, table='items'):
+        self.path = path
+        self.table = table
+        self._db = None
+
+    def open(self, key):
+        self._db = sqlite3.connect(self.path)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" (id INTEGER PRIMARY KEY, data TEXT NOT NULL)'.format(self.table)
+            )
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS genericclient_checkpoints '
+                '("table" TEXT PRIMARY KEY, key TEXT NOT NULL, url TEXT, items INTEGER NOT NULL, done INTEGER NOT NULL)'
+            )
+        row = self._db.execute(
+            'SELECT key, url, items, done FROM genericclient_checkpoints WHERE "table" = ?', (self.table,)
+        ).fetchone()
+        checkpoint = self.check_key(Checkpoint(row[0], row[1], row[2], bool(row[3])), key) if row else None
+        if checkpoint is None:
+            with self._db:
+                self._db.execute('DELETE FROM "{}"'.format(self.table))
+        self.checkpoint = checkpoint or Checkpoint(key)
+        return checkpoint
+
+    def write(self, results, url):
+        self.checkpoint.url = url
+        self.checkpoint.items += len(results)
+        with self._db:
+            self._db.executemany(
+                'INSERT INTO "{}" (data) VALUES (?)'.format(self.table),
+                ((json.dumps(result),) for result in results),
+            )
+            self._save()
+
+    def finish(self):
+        self.checkpoint.done = True
+        with self._db:
+            self._save()
+
+    def _save(self):
+        checkpoint = self.checkpoint
+        self._db.execute(
+            'INSERT OR REPLACE INTO genericclient_checkpoints ("table", key, url, items, done) VALUES (?, ?, ?, ?, ?)',
+            (self.table, checkpoint.key, checkpoint.url, checkpoint.items, checkpoint.done),
+        )
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,75 @@
+import collections
+import importlib
+
+
+class JSONBackend(object):
+    def __init__(self, name, dumps, loads):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def encode(self, obj):
+        """Return ``obj`` as UTF-8 encoded JSON, whether ``dumps`` returns text or ``bytes``."""
+        data = self.dumps(obj)
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        return data
+
+    def __repr__(self):
+        return '<{0} `{1}`>'.format(self.__class__.__name__, self.name)
+
+
+def _module_backend(name):
+    module = importlib.import_module(name)
+    return JSONBackend(name, module.dumps, module.loads)
+
+
+def _orjson_backend(name):
+    orjson = importlib.import_module(name)
+
+    def dumps(obj):
+        # Like ``json``, accept keys that aren't strings.
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return JSONBackend(name, dumps, orjson.loads)
+
+
+# Fastest first. All of them accept ``bytes`` in ``loads``.
+BACKENDS = collections.OrderedDict((
+    ('orjson', _orjson_backend),
+    ('ujson', _module_backend),
+    ('simplejson', _module_backend),
+    ('json', _module_backend),
+))
+
+
+def available_backends():
+    backends = []
+    for name, factory in BACKENDS.items():
+        try:
+            backends.append(factory(name))
+        except ImportError:
+            pass
+    return backends
+
+
+def get_backend(backend=None):
+    """Return a ``JSONBackend``.
+
+    ``backend`` can be ``None`` (the standard ``json`` module), the name of
+    one of ``BACKENDS``, or any object with ``dumps`` and ``loads`` callables,
+    like the ``json`` module itself.
+    """
+    if backend is None:
+        backend = 'json'
+    if isinstance(backend, JSONBackend):
+        return backend
+    if isinstance(backend, type('')):
+        if backend not in BACKENDS:
+            raise ValueError("Unknown JSON backend `{}`. Choose one of: {}".format(
+                backend, ', '.join(BACKENDS),
+            ))
+        return BACKENDS[backend](backend)
+    if callable(getattr(backend, 'dumps', None)) and callable(getattr(backend, 'loads', None)):
+        name = getattr(backend, '__name__', backend.__class__.__name__)
+        return JSONBackend(name, backend.dumps, backend.loads)
+    raise TypeError("JSON backend must have `dumps` and `loads` callables, got {!r}".format(backend))
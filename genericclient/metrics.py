@@ -0,0 +1,181 @@
+import collections
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PAGE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram(object):
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+    def to_dict(self):
+        return {
+            'buckets': collections.OrderedDict(self.cumulative()),
+            'count': self.count,
+            'sum': self.sum,
+        }
+
+
+class RouteMetrics(object):
+    __slots__ = ('duration', 'decode', 'statuses', 'bytes_in', 'bytes_out', 'retries')
+
+    def __init__(self, buckets):
+        self.duration = Histogram(buckets)
+        self.decode = Histogram(buckets)
+        self.statuses = collections.Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+
+    def to_dict(self):
+        return {
+            'duration': self.duration.to_dict(),
+            'decode': self.decode.to_dict(),
+            'statuses': dict(self.statuses),
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'retries': self.retries,
+        }
+
+
+def _labels(labels, **extra):
+    items = list(labels.items()) + list(extra.items())
+    return '{' + ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for key, value in items
+    ) + '}'
+
+
+class Metrics(object):
+    """Collects latency, sizes, status codes, retries and pagination depth.
+
+    Requests are grouped by endpoint, method and route: the URL template
+    of the request, like ``users/{pk}`` or ``users/{pk}/lock``. Pass an
+    instance to ``GenericClient(metrics=...)``, then export it with
+    ``to_dict()`` or ``to_prometheus()``. Instances are thread-safe.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, page_buckets=PAGE_BUCKETS):
+        self.buckets = buckets
+        self.page_buckets = page_buckets
+        self._routes = {}
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def hooks(self):
+        return {
+            'after_response': self.after_response,
+            'on_retry': self.on_retry,
+            'after_pages': self.after_pages,
+        }
+
+    def _route(self, endpoint, method, route):
+        key = (endpoint, method.upper(), route)
+        metrics = self._routes.get(key)
+        if metrics is None:
+            metrics = self._routes[key] = RouteMetrics(self.buckets)
+        return metrics
+
+    def after_response(self, endpoint, route, method, response, elapsed, timings, bytes_in, bytes_out, **kwargs):
+        with self._lock:
+            metrics = self._route(endpoint, method, route)
+            metrics.duration.observe(elapsed)
+            metrics.decode.observe(timings['decode'])
+            metrics.statuses[response.status_code] += 1
+            metrics.bytes_in += bytes_in
+            metrics.bytes_out += bytes_out
+
+    def on_retry(self, endpoint, route, method, **kwargs):
+        with self._lock:
+            self._route(endpoint, method, route).retries += 1
+
+    def after_pages(self, endpoint, pages, **kwargs):
+        with self._lock:
+            histogram = self._pages.get(endpoint)
+            if histogram is None:
+                histogram = self._pages[endpoint] = Histogram(self.page_buckets)
+            histogram.observe(pages)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._pages.clear()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'routes': [
+                    dict(endpoint=endpoint, method=method, route=route, **metrics.to_dict())
+                    for (endpoint, method, route), metrics in sorted(self._routes.items())
+                ],
+                'pages': {endpoint: histogram.to_dict() for endpoint, histogram in self._pages.items()},
+            }
+
+    def to_prometheus(self, prefix='genericclient'):
+        lines = []
+
+        def histogram(name, help, series):
+            lines.append('# HELP {}_{} {}'.format(prefix, name, help))
+            lines.append('# TYPE {}_{} histogram'.format(prefix, name))
+            for labels, value in series:
+                for bound, count in value.cumulative():
+                    lines.append('{}_{}_bucket{} {}'.format(prefix, name, _labels(labels, le=bound), count))
+                lines.append('{}_{}_bucket{} {}'.format(prefix, name, _labels(labels, le='+Inf'), value.count))
+                lines.append('{}_{}_sum{} {}'.format(prefix, name, _labels(labels), value.sum))
+                lines.append('{}_{}_count{} {}'.format(prefix, name, _labels(labels), value.count))
+
+        def counter(name, help, series):
+            lines.append('# HELP {}_{} {}'.format(prefix, name, help))
+            lines.append('# TYPE {}_{} counter'.format(prefix, name))
+            for labels, value in series:
+                lines.append('{}_{}{} {}'.format(prefix, name, _labels(labels), value))
+
+        with self._lock:
+            routes = [
+                (collections.OrderedDict([('endpoint', endpoint), ('method', method), ('route', route)]), metrics)
+                for (endpoint, method, route), metrics in sorted(self._routes.items())
+            ]
+            histogram('request_duration_seconds', 'Time spent on requests, retries and decoding included.', [
+                (labels, metrics.duration) for labels, metrics in routes
+            ])
+            histogram('decode_duration_seconds', 'Time spent decoding responses.', [
+                (labels, metrics.decode) for labels, metrics in routes
+            ])
+            counter('responses_total', 'Responses received, by status code.', [
+                (collections.OrderedDict(labels, status=status), count)
+                for labels, metrics in routes for status, count in sorted(metrics.statuses.items())
+            ])
+            counter('response_bytes_total', 'Bytes received.', [
+                (labels, metrics.bytes_in) for labels, metrics in routes
+            ])
+            counter('request_bytes_total', 'Bytes of request bodies sent.', [
+                (labels, metrics.bytes_out) for labels, metrics in routes
+            ])
+            counter('retries_total', 'Requests retried.', [
+                (labels, metrics.retries) for labels, metrics in routes
+            ])
+            histogram('pagination_pages', 'Pages fetched per call.', [
+                (collections.OrderedDict([('endpoint', endpoint)]), value)
+                for endpoint, value in sorted(self._pages.items())
+            ])
+        return '\n'.join(lines) + '\n'
@@ -1 +1,405 @@
+import collections
+import copy
+
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+except ImportError:
+    from urlparse import urljoin, urlparse, urlunparse, parse_qsl
+    from urllib import urlencode
+
 from genericclient_base.pagination import *  # noqa
+
+
+def iter_link_header(endpoint, params):
+    lookup = params.copy()
+    url = endpoint.url
+
+    while True:
+        response = endpoint.request('get', url, params=lookup)
+        yield response, response.data
+        link = response.links.get('next')
+        if link is None:
+            break
+        lookup = {}
+        url = link['url']
+
+
+def iter_pages(paginator, endpoint, params, limit=None):
+    """Return an iterator of ``(response, results)``, one for each page.
+
+    ``paginator`` is anything accepted by ``GenericClient(autopaginate=...)``.
+    Paginators exposing an ``iter_pages(endpoint, params)`` method are
+    streamed page by page; other callables are called once and produce a
+    single page with all the results. With ``limit``, pages stop once that
+    many results are returned, and paginators exposing
+    ``with_max_items(limit)`` don't request any page past them.
+    """
+    if limit is not None:
+        if hasattr(paginator, 'with_max_items'):
+            paginator = paginator.with_max_items(limit)
+        return take(iter_pages(paginator, endpoint, params), limit)
+
+    if paginator is None:
+        response = endpoint.request('get', endpoint.url, params=params)
+        pages = [(response, response.data)]
+    elif hasattr(paginator, 'iter_pages'):
+        pages = paginator.iter_pages(endpoint, params)
+    elif paginator is link_header:
+        pages = iter_link_header(endpoint, params)
+    else:
+        pages = [paginator(endpoint, params)]
+
+    return iter(pages)
+
+
+def take(pages, limit):
+    """Iterate over ``pages`` until ``limit`` results, trimming the last page, then close ``pages``."""
+    remaining = limit
+    try:
+        while remaining > 0:
+            page = next(pages, None)
+            if page is None:
+                break
+            response, results = page
+            if response.status_code >= 400 or not isinstance(results, list):
+                # Errors and single objects are left for the caller to handle.
+                yield page
+                break
+            results = results[:remaining]
+            remaining -= len(results)
+            yield response, results
+    finally:
+        if hasattr(pages, 'close'):
+            pages.close()
+
+
+def prefetch(pages):
+    """Iterate over ``pages`` while fetching the next item in the background."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(next, pages, None)
+    try:
+        while True:
+            page = future.result()
+            if page is None:
+                break
+            future = executor.submit(next, pages, None)
+            yield page
+            del page
+    finally:
+        if not future.cancel():
+            try:
+                future.result()
+            except Exception:
+                pass
+        if hasattr(pages, 'close'):
+            pages.close()
+        executor.shutdown(wait=False)
+
+
+def _link_url(response, rel):
+    link = response.links.get(rel)
+    if link is None:
+        return None
+    return link['url']
+
+
+def _cancel(pending):
+    while pending:
+        pending.popleft()[2].cancel()
+
+
+class PrefetchLinkHeader(object):
+    """Like ``link_header``, but fetches upcoming pages concurrently.
+
+    Once a ``rel=next`` link carries a page number (``?page=N``), up to
+    ``max_workers`` of the following pages are requested ahead of time on a
+    thread pool. If the server also sends ``rel=last``, prefetching stops at
+    that page; otherwise up to ``max_workers - 1`` requests past the end may
+    be issued and discarded. Links without a page number are followed one
+    by one, exactly like ``link_header``.
+    """
+
+    def __init__(self, max_workers=4, page_param='page'):
+        if max_workers < 1:
+            raise ValueError("`max_workers` must be at least 1, got {!r}".format(max_workers))
+        self.max_workers = max_workers
+        self.page_param = page_param
+
+    def __call__(self, endpoint, params):
+        results = []
+        for response, data in self.iter_pages(endpoint, params):
+            results += data
+        return response, results
+
+    def iter_pages(self, endpoint, params):
+        response = endpoint.request('get', endpoint.url, params=params.copy())
+        yield response, response.data
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = collections.deque()
+        try:
+            url = _link_url(response, 'next')
+            while url is not None:
+                number = self._page_number(url)
+                if number is None:
+                    _cancel(pending)
+                    response = endpoint.request('get', url)
+                else:
+                    url = self._page_url(url, number)
+                    if pending and pending[0][0] != url:
+                        # The server's links don't match our guess: start over.
+                        _cancel(pending)
+                    last = self._page_number(_link_url(response, 'last'))
+                    self._fill(executor, pending, endpoint, url, number, last)
+                    response = pending.popleft()[2].result()
+                yield response, response.data
+                url = _link_url(response, 'next')
+        finally:
+            _cancel(pending)
+            executor.shutdown(wait=False)
+
+    def _fill(self, executor, pending, endpoint, url, number, last):
+        if not pending:
+            pending.append((url, number, executor.submit(endpoint.request, 'get', url)))
+        number = pending[-1][1] + 1
+        while len(pending) < self.max_workers and (last is None or number <= last):
+            page_url = self._page_url(url, number)
+            pending.append((page_url, number, executor.submit(endpoint.request, 'get', page_url)))
+            number += 1
+
+    def _page_number(self, url):
+        if url is None:
+            return None
+        for key, value in parse_qsl(urlparse(url).query, keep_blank_values=True):
+            if key == self.page_param:
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    def _page_url(self, url, number):
+        parts = urlparse(url)
+        query = [
+            (key, str(number) if key == self.page_param else value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        ]
+        return urlunparse(parts._replace(query=urlencode(query)))
+
+
+prefetch_link_header = PrefetchLinkHeader()
+
+
+class EnvelopePaginator(object):
+    """Base class of the paginators of responses wrapped in a JSON envelope.
+
+    The results of each page are found under ``results_key``, and the
+    total number of items, if the server reports it, under ``count_key``.
+    No more than ``max_items`` results are returned, and no page past them
+    is requested.
+    """
+
+    def __init__(self, results_key='results', count_key='count', max_items=None, max_workers=4):
+        if max_workers < 1:
+            raise ValueError("`max_workers` must be at least 1, got {!r}".format(max_workers))
+        self.results_key = results_key
+        self.count_key = count_key
+        self.max_items = max_items
+        self.max_workers = max_workers
+
+    def __call__(self, endpoint, params):
+        results = []
+        for response, data in self.iter_pages(endpoint, params):
+            results += data
+        return response, results
+
+    def iter_pages(self, endpoint, params):
+        pages = self.iter_envelopes(endpoint, params.copy())
+        if self.max_items is None:
+            return pages
+        return take(pages, self.max_items)
+
+    def with_max_items(self, max_items):
+        paginator = copy.copy(self)
+        if self.max_items is None or max_items < self.max_items:
+            paginator.max_items = max_items
+        return paginator
+
+    def iter_envelopes(self, endpoint, params):
+        raise NotImplementedError
+
+    def unwrap(self, response):
+        """Return the results of a page, and its envelope (``None`` for a plain list)."""
+        data = response.data
+        if not isinstance(data, dict):
+            return data, None
+        return data.get(self.results_key) or [], data
+
+    def count(self, envelope):
+        if envelope is None or self.count_key is None:
+            return None
+        try:
+            return int(envelope[self.count_key])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def fetch_all(self, endpoint, pages_params):
+        """Yield the pages requested with each of ``pages_params``, ``max_workers`` at a time."""
+        pages_params = iter(pages_params)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = collections.deque()
+        try:
+            while True:
+                for page_params in pages_params:
+                    pending.append(executor.submit(endpoint.request, 'get', endpoint.url, params=page_params))
+                    if len(pending) >= self.max_workers:
+                        break
+                if not pending:
+                    break
+                response = pending.popleft().result()
+                yield response, self.unwrap(response)[0]
+        finally:
+            while pending:
+                pending.popleft().cancel()
+            executor.shutdown(wait=False)
+
+
+class EnvelopeCursor(EnvelopePaginator):
+    """Follow the ``next_key`` of each page's envelope, one page at a time.
+
+    ``next`` can be the URL of the next page, or a cursor sent back as
+    ``cursor_param`` along with the original parameters.
+    """
+
+    def __init__(self, next_key='next', cursor_param='cursor', results_key='results', count_key='count',
+                 max_items=None):
+        super(EnvelopeCursor, self).__init__(results_key, count_key, max_items)
+        self.next_key = next_key
+        self.cursor_param = cursor_param
+
+    def iter_envelopes(self, endpoint, params):
+        response = endpoint.request('get', endpoint.url, params=params)
+        while True:
+            results, envelope = self.unwrap(response)
+            yield response, results
+            cursor = envelope.get(self.next_key) if envelope is not None else None
+            if not cursor:
+                break
+            cursor = str(cursor)
+            if '://' in cursor or cursor.startswith('/'):
+                response = endpoint.request('get', urljoin(endpoint.url, cursor))
+            else:
+                response = endpoint.request('get', endpoint.url, params=dict(params, **{self.cursor_param: cursor}))
+
+
+class OffsetLimit(EnvelopePaginator):
+    """Request pages with ``offset_param`` and ``limit_param``, ``limit`` items at a time.
+
+    Servers may send less than ``limit``: the following offsets step by the
+    length of the first page. Once the first page reports the total count,
+    all the following pages are known, and requested ``max_workers`` at a
+    time. Without a count, pages are requested one by one until one comes
+    back empty, or shorter than the first one.
+    """
+
+    def __init__(self, limit=100, offset_param='offset', limit_param='limit', results_key='results',
+                 count_key='count', max_items=None, max_workers=4):
+        super(OffsetLimit, self).__init__(results_key, count_key, max_items, max_workers)
+        self.limit = limit
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+
+    def page_params(self, params, offset, end):
+        limit = self.limit if end is None else min(self.limit, end - offset)
+        return dict(params, **{self.offset_param: offset, self.limit_param: limit})
+
+    def iter_envelopes(self, endpoint, params):
+        offset = int(params.get(self.offset_param, 0))
+        end = None if self.max_items is None else offset + self.max_items
+        response = endpoint.request('get', endpoint.url, params=self.page_params(params, offset, end))
+        results, envelope = self.unwrap(response)
+        yield response, results
+
+        step = len(results)
+        if not step:
+            return
+        count = self.count(envelope)
+        if count is not None:
+            end = count if end is None else min(count, end)
+            offsets = range(offset + step, end, step)
+            for page in self.fetch_all(endpoint, (self.page_params(params, o, end) for o in offsets)):
+                yield page
+            return
+
+        while results and len(results) >= step:
+            offset += len(results)
+            if end is not None and offset >= end:
+                break
+            response = endpoint.request('get', endpoint.url, params=self.page_params(params, offset, end))
+            results, envelope = self.unwrap(response)
+            yield response, results
+
+
+class PageNumber(EnvelopePaginator):
+    """Request pages by number with ``page_param``, starting at ``first_page``.
+
+    ``page_size`` is sent as ``page_size_param`` when set, lowered to
+    ``max_items`` if needed, but the length of the first page is what
+    counts. Once the first page reports the total count, all the following
+    pages are requested ``max_workers`` at a time. Without a count, pages
+    are requested one by one until one comes back short, or without
+    ``next_key``.
+    """
+
+    def __init__(self, page_size=None, page_param='page', page_size_param='page_size', first_page=1,
+                 next_key='next', results_key='results', count_key='count', max_items=None, max_workers=4):
+        super(PageNumber, self).__init__(results_key, count_key, max_items, max_workers)
+        self.page_size = page_size
+        self.page_param = page_param
+        self.page_size_param = page_size_param
+        self.first_page = first_page
+        self.next_key = next_key
+
+    def page_params(self, params, number):
+        params = dict(params, **{self.page_param: number})
+        page_size = self.page_size
+        if self.max_items is not None:
+            page_size = min(page_size or self.max_items, self.max_items)
+        if page_size is not None and self.page_size_param is not None:
+            params[self.page_size_param] = page_size
+        return params
+
+    def iter_envelopes(self, endpoint, params):
+        number = int(params.get(self.page_param, self.first_page))
+        response = endpoint.request('get', endpoint.url, params=self.page_params(params, number))
+        results, envelope = self.unwrap(response)
+        yield response, results
+
+        # The first page is full if there are more: servers may send less than asked for.
+        page_size = len(results)
+        if not page_size or envelope is None:
+            return
+        start = (number - self.first_page) * page_size
+        count = self.count(envelope)
+        if count is not None:
+            if self.max_items is not None:
+                count = min(count, start + self.max_items)
+            last = self.first_page + (count - 1) // page_size
+            numbers = range(number + 1, last + 1)
+            for page in self.fetch_all(endpoint, (self.page_params(params, n) for n in numbers)):
+                yield page
+            return
+
+        fetched = len(results)
+        while len(results) >= page_size and (self.next_key not in envelope or envelope[self.next_key]):
+            if self.max_items is not None and fetched >= self.max_items:
+                break
+            number += 1
+            response = endpoint.request('get', endpoint.url, params=self.page_params(params, number))
+            results, envelope = self.unwrap(response)
+            yield response, results
+            fetched += len(results)
+            if envelope is None:
+                break
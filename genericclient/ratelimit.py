@@ -0,0 +1,143 @@
+import threading
+import time
+
+
+class TokenBucket(object):
+    """Allow ``rate`` calls per second on average, in bursts of up to ``burst``.
+
+    ``rate=None`` means no limit, unless a lower one is set with ``limit()``.
+    """
+
+    def __init__(self, rate=None, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, rate or 1)
+        self.tokens = self.burst
+        self._updated = time.time()
+        self._ceiling = None
+        self._ceiling_until = 0
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    @property
+    def effective_rate(self):
+        rate = self.rate
+        if self._ceiling is not None and time.time() < self._ceiling_until:
+            rate = self._ceiling if rate is None else min(rate, self._ceiling)
+        return rate
+
+    def limit(self, rate, until):
+        with self._lock:
+            self._ceiling = rate
+            self._ceiling_until = until
+
+    def pause(self, until):
+        with self._lock:
+            self._paused_until = max(self._paused_until, until)
+
+    def _wait_time(self, now):
+        if now < self._paused_until:
+            return self._paused_until - now
+        rate = self.effective_rate
+        if rate is None:
+            return 0
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * rate)
+        self._updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / rate
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                wait = self._wait_time(time.time())
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+class RateLimiter(object):
+    """Throttle requests to stay under an upstream quota.
+
+    Combines a ``TokenBucket`` of ``rate`` requests per second and a limit
+    of ``max_in_flight`` concurrent requests. With ``adaptive``, it slows
+    down following the ``Retry-After`` and ``X-RateLimit-*`` headers of the
+    responses. Instances are thread-safe, and can be shared by clients.
+    """
+    remaining_header = 'X-RateLimit-Remaining'
+    reset_header = 'X-RateLimit-Reset'
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None, adaptive=True):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_in_flight = max_in_flight
+        self.adaptive = adaptive
+        self._semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+
+    def __repr__(self):
+        return '<{0} rate={1} max_in_flight={2}>'.format(
+            self.__class__.__name__, self.bucket.rate, self.max_in_flight,
+        )
+
+    def acquire(self):
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            self.bucket.acquire()
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self):
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def _reset_time(self, value, now):
+        value = float(value)
+        # Either seconds until the reset, or a UNIX timestamp.
+        if value > 10 ** 9:
+            return value
+        return now + value
+
+    def update(self, status_code, headers):
+        if not self.adaptive:
+            return
+        now = time.time()
+        try:
+            if status_code in (429, 503) and headers.get('Retry-After', '').strip().isdigit():
+                self.bucket.pause(now + int(headers['Retry-After']))
+            remaining = headers.get(self.remaining_header)
+            reset = headers.get(self.reset_header)
+            if remaining is None or reset is None:
+                return
+            remaining, reset = int(remaining), self._reset_time(reset, now)
+        except ValueError:
+            return
+        if reset <= now:
+            return
+        if remaining <= 0:
+            self.bucket.pause(reset)
+        else:
+            # Spread what's left of the quota until it resets.
+            self.bucket.limit(remaining / (reset - now), reset)
+
+
+def release_on_close(response, limiters):
+    """Release ``limiters`` once ``response`` is closed, when its body has been read."""
+    close = response.close
+
+    def release():
+        try:
+            close()
+        finally:
+            while limiters:
+                limiters.pop().release()
+
+    response.close = release
+    return response
@@ -0,0 +1,94 @@
+import email.utils
+import random
+import threading
+import time
+
+import requests
+
+
+class Retry(object):
+    """When and how long to wait before retrying a failed request.
+
+    A request is retried, up to ``max_attempts`` attempts in total, when its
+    method is in ``methods`` and it either raised one of ``exceptions`` or
+    got a status code in ``statuses``. Attempt ``n`` waits
+    ``backoff_factor * 2 ** (n - 1)`` seconds (at most ``backoff_max``),
+    randomized between 0 and that value with ``jitter``, or what the
+    server asks for in ``Retry-After``. No retry starts if it would end
+    after ``deadline`` seconds since the first attempt.
+    """
+    DEFAULT_STATUSES = frozenset((429, 502, 503, 504))
+    # Idempotent methods only: retrying a POST could create duplicates.
+    DEFAULT_METHODS = frozenset(('get', 'head', 'options', 'put', 'delete'))
+    DEFAULT_EXCEPTIONS = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+    )
+
+    def __init__(self, max_attempts=3, statuses=DEFAULT_STATUSES, methods=DEFAULT_METHODS,
+                 exceptions=DEFAULT_EXCEPTIONS, backoff_factor=0.5, backoff_max=60, jitter=True,
+                 respect_retry_after=True, deadline=None, on_retry=None):
+        self.max_attempts = max_attempts
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.lower() for method in methods)
+        self.exceptions = tuple(exceptions)
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.deadline = deadline
+        self.on_retry = on_retry
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<{0} max_attempts={1}>'.format(self.__class__.__name__, self.max_attempts)
+
+    def backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def parse_retry_after(self, headers):
+        value = headers.get('Retry-After')
+        if value is None:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+        date = email.utils.parsedate_tz(value)
+        if date is None:
+            return None
+        return max(0, email.utils.mktime_tz(date) - time.time())
+
+    def get_delay(self, method, attempt, started, response=None, exception=None):
+        """Return how long to wait before the next attempt, or ``None`` not to retry."""
+        if attempt >= self.max_attempts or method.lower() not in self.methods:
+            return None
+        if exception is not None:
+            if not isinstance(exception, self.exceptions):
+                return None
+            delay = self.backoff(attempt)
+        else:
+            if response.status_code not in self.statuses:
+                return None
+            delay = self.backoff(attempt)
+            retry_after = self.parse_retry_after(response.headers) if self.respect_retry_after else None
+            if retry_after is not None:
+                if retry_after > self.backoff_max:
+                    return None
+                delay = retry_after
+        if self.deadline is not None and time.time() + delay - started > self.deadline:
+            return None
+        return delay
+
+    def record(self, method, url, attempt, delay, response=None, exception=None):
+        with self._lock:
+            self.retries += 1
+        if self.on_retry is not None:
+            self.on_retry(
+                method=method, url=url, attempt=attempt, delay=delay,
+                response=response, exception=exception,
+            )
@@ -1,18 +1,49 @@
 from genericclient_base import utils
 
 
+class URLTemplate(object):
+    """The URLs and route labels of an action, computed once per endpoint and name."""
+    __slots__ = ('list_url', 'list_route', 'detail_prefix', 'detail_suffix', 'detail_route')
+
+    def __init__(self, url, endpoint_name, name, trail):
+        self.list_url = utils.urljoin(url, [name], trail)
+        self.list_route = '{}/{}'.format(endpoint_name, name)
+        self.detail_prefix = url if url.endswith('/') else url + '/'
+        self.detail_suffix = utils.urljoin('', [name], trail)
+        self.detail_route = '{}/{{pk}}/{}'.format(endpoint_name, name)
+
+    def detail_url(self, pk):
+        pk = str(pk)
+        if pk.startswith('/'):
+            return utils.urljoin(self.detail_prefix, [pk, self.detail_suffix.lstrip('/')])
+        return self.detail_prefix + pk + self.detail_suffix
+
+
+def url_template(endpoint, name):
+    # Memoized on the endpoint itself, so the templates go away with the client.
+    templates = endpoint.__dict__.get('_url_templates')
+    if templates is None:
+        templates = endpoint.__dict__['_url_templates'] = {}
+    template = templates.get(name)
+    if template is None:
+        template = templates[name] = URLTemplate(endpoint.url, endpoint.name, name, endpoint.trail)
+    return template
+
+
 class Action(object):
+    __slots__ = ('name', 'endpoint', 'method', 'trail', 'url', 'route')
 
     def __init__(self, endpoint, method, name):
         self.name = name
         self.endpoint = endpoint
         self.method = method
-        self.trail = self.endpoint.trail
-        self.url = utils.urljoin(self.endpoint.url, [name], self.trail)
-        super(Action, self).__init__()
+        self.trail = endpoint.trail
+        template = url_template(endpoint, name)
+        self.url = template.list_url
+        self.route = template.list_route
 
     def __call__(self, **kwargs):
-        return self.endpoint.request(self.method, self.url, json=kwargs)
+        return self.endpoint.request(self.method, self.url, json=kwargs, _route=self.route)
 
     def __repr__(self):
         return '<{0} `{1}` on {2}`>'.format(
@@ -24,19 +55,22 @@ class Action(object):
 
 
 class ListAction(Action):
-    pass
+    __slots__ = ()
 
 
 class DetailAction(Action):
+    __slots__ = ('lookup', 'pk')
 
     def __init__(self, endpoint, method, name, **lookup):
-        super(DetailAction, self).__init__(endpoint, method, name)
+        self.name = name
+        self.endpoint = endpoint
+        self.method = method
+        self.trail = endpoint.trail
         self.lookup = lookup
-        self.url = utils.urljoin(self.endpoint.url, [self.pk, name], self.trail)
-
-    @property
-    def pk(self):
-        return utils.find_pk(self.lookup)
+        self.pk = utils.find_pk(lookup)
+        template = url_template(endpoint, name)
+        self.url = template.detail_url(self.pk)
+        self.route = template.detail_route
 
     def __repr__(self):
         return '<{0} `{1}` on {2} with lookup `{3!r}`>'.format(
@@ -45,6 +79,7 @@ class DetailAction(Action):
 
 
 class Route(object):
+    __slots__ = ('_endpoint', '_method')
     whitelist = (
         'action_class',
         '__class__',
@@ -56,7 +91,6 @@ class Route(object):
     def __init__(self, endpoint, method):
         self._method = method
         self._endpoint = endpoint
-        super(Route, self).__init__()
 
     def __setattr__(self, name, value):
         if name == 'whitelist' or name in self.whitelist:
@@ -66,16 +100,18 @@ class Route(object):
         return self.action_class(self._endpoint, self._method, name)
 
     def __repr__(self):
-        return '<{0} on `{}`>'.format(
+        return '<{0} on `{1}`>'.format(
             self.__class__.__name__, self._endpoint.url,
         )
 
 
 class ListRoute(Route):
+    __slots__ = ()
     action_class = ListAction
 
 
 class DetailRoute(Route):
+    __slots__ = ('_lookup',)
     action_class = DetailAction
 
     def __init__(self, endpoint, method, **kwargs):
@@ -86,6 +122,6 @@ class DetailRoute(Route):
         return self.action_class(self._endpoint, self._method, name, **self._lookup)
 
     def __repr__(self):
-        return '<{0} on `{}` with lookup `{1!r}`>'.format(
+        return '<{0} on `{1}` with lookup `{2!r}`>'.format(
             self.__class__.__name__, self._endpoint.url, self._lookup,
         )
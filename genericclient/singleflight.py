@@ -0,0 +1,75 @@
+import collections
+import threading
+import time
+
+
+class _Call(object):
+    __slots__ = ('event', 'value', 'exception', 'expires')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.exception = None
+        self.expires = None
+
+    def result(self):
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+
+class SingleFlight(object):
+    """Share one call among the threads asking for the same key at once.
+
+    While a call for ``key`` is running, other callers of ``do(key, ...)``
+    wait for it and get its result (or its exception) instead of calling
+    ``func`` themselves. Successful results are then reused for ``ttl``
+    seconds.
+    """
+
+    def __init__(self, ttl=0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._expiring = collections.deque()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def _purge(self, now):
+        while self._expiring and self._expiring[0][0] <= now:
+            _, key, call = self._expiring.popleft()
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def do(self, key, func):
+        with self._lock:
+            self._purge(time.time())
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            return call.result()
+
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.exception = e
+        finally:
+            with self._lock:
+                if self.ttl > 0 and call.exception is None:
+                    call.expires = time.time() + self.ttl
+                    self._expiring.append((call.expires, key, call))
+                elif self._calls.get(key) is call:
+                    del self._calls[key]
+            call.event.set()
+        return call.result()
+
+    def forget(self, key):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.event.is_set():
+                del self._calls[key]
@@ -0,0 +1,96 @@
+import contextlib
+import time
+
+from requests.structures import CaseInsensitiveDict
+
+
+class Tracer(object):
+    """Creates OpenTelemetry spans for the calls, pages and requests of a client.
+
+    OpenTelemetry is only imported when an instance is created, that is
+    when tracing is enabled on a ``GenericClient``.
+    """
+
+    def __init__(self, tracer=None):
+        from opentelemetry import propagate, trace
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        self.propagate = propagate
+        self.trace = trace
+        self.SpanKind = SpanKind
+        self.Status = Status
+        self.StatusCode = StatusCode
+        if tracer is None:
+            tracer = trace.get_tracer('genericclient')
+        self.tracer = tracer
+
+    @contextlib.contextmanager
+    def ending(self, span):
+        try:
+            yield span
+        except Exception as e:
+            span.record_exception(e)
+            span.set_status(self.Status(self.StatusCode.ERROR, str(e)))
+            raise
+        finally:
+            span.end()
+
+    @contextlib.contextmanager
+    def call(self, name, endpoint):
+        """A span for a logical call, parent of all the spans of its pages and requests.
+
+        It isn't made current: its requests can run on other threads.
+        """
+        span = self.tracer.start_span(name, attributes={'genericclient.endpoint': endpoint.name})
+        endpoint._trace_context = self.trace.set_span_in_context(span)
+        with self.ending(span):
+            yield span
+
+    @contextlib.contextmanager
+    def request(self, parent, method, url, route, attempt, kwargs):
+        attributes = {
+            'http.request.method': method.upper(),
+            'url.full': url,
+            'url.template': route,
+        }
+        if attempt > 1:
+            attributes['http.request.resend_count'] = attempt - 1
+        if kwargs.get('data') is not None:
+            attributes['http.request.body.size'] = len(kwargs['data'])
+        span = self.tracer.start_span(
+            '{} {}'.format(method.upper(), route), context=parent, kind=self.SpanKind.CLIENT, attributes=attributes,
+        )
+        kwargs['headers'] = CaseInsensitiveDict(kwargs.get('headers') or {})
+        self.propagate.inject(kwargs['headers'], context=self.trace.set_span_in_context(span))
+        with self.ending(span):
+            yield span
+
+    def response(self, span, status_code):
+        span.set_attribute('http.response.status_code', status_code)
+        if status_code >= 400:
+            span.set_status(self.Status(self.StatusCode.ERROR))
+
+    @contextlib.contextmanager
+    def decode(self, parent, route):
+        span = self.tracer.start_span('decode {}'.format(route), context=parent)
+        with self.ending(span):
+            yield span
+
+    def pages(self, parent, name, pages):
+        page = 0
+        while True:
+            started = time.time()
+            item = next(pages, None)
+            if item is None:
+                break
+            page += 1
+            response, results = item
+            span = self.tracer.start_span(
+                '{} page {}'.format(name, page), context=parent, start_time=int(started * 1e9), attributes={
+                    'genericclient.page': page,
+                    'genericclient.page.items': len(results),
+                    'http.response.status_code': response.status_code,
+                },
+            )
+            span.end()
+            yield item
@@ -1 +1,173 @@
+import codecs
+import json
+
+try:
+    from urllib.parse import urlparse, urlunparse
+except ImportError:
+    from urlparse import urlparse, urlunparse
+
+from genericclient_base import exceptions
 from genericclient_base.utils import *  # noqa
+
+
+def check_response(response, url, auth=None):
+    if response.status_code in (401, 403):
+        if auth:
+            msg = "Failed request to `{}`. Cannot authenticate user `{}` on the API.".format(
+                url, auth[0],
+            )
+        else:
+            msg = "Failed request to `{}`. User is not authenticated.".format(
+                url,
+            )
+
+        raise exceptions.NotAuthenticatedError(
+            response, msg,
+        )
+    elif response.status_code == 400:
+        raise exceptions.BadRequestError(
+            response,
+            "Bad Request 400: {}".format(response.data)
+        )
+
+
+PK_FIELDS = ('id', 'uuid', 'pk')
+
+
+def project(results, fields):
+    # Resources need their primary key to be saved or deleted.
+    fields = tuple(fields) + tuple(key for key in PK_FIELDS if key not in fields)
+    if isinstance(results, dict):
+        return {key: results[key] for key in fields if key in results}
+    return [{key: result[key] for key in fields if key in result} for result in results]
+
+
+def sorted_query(url):
+    """``url`` with its query parameters sorted by name, to compare URLs whatever their order."""
+    parts = urlparse(url)
+    if not parts.query:
+        return url
+    query = '&'.join(sorted(parts.query.split('&'), key=lambda pair: pair.split('=', 1)[0]))
+    return urlunparse(parts._replace(query=query))
+
+
+def excerpt(text, pos, width=40):
+    """The text around ``pos``, to point at where a document is invalid."""
+    start, end = max(pos - width, 0), pos + width
+    return '{}{}{}'.format('...' if start else '', text[start:end], '...' if end < len(text) else '')
+
+
+def bytes_received(response):
+    # Bytes read from the socket, before decompression.
+    try:
+        return response.raw.tell()
+    except (AttributeError, IOError):
+        return len(response.content)
+
+
+def is_utf8(encoding):
+    if encoding is None:
+        return True
+    try:
+        return codecs.lookup(encoding).name == 'utf-8'
+    except LookupError:
+        return False
+
+
+def utf8_content(response):
+    if is_utf8(response.encoding):
+        return response.content
+    return response.text.encode('utf-8')
+
+
+class JSONStream(object):
+    """Incrementally decode JSON from an iterable of text chunks.
+
+    Top-level arrays can be consumed item by item with ``iter_items()``,
+    so the raw text of the whole document never needs to be in memory.
+    """
+    whitespace = ' \t\n\r'
+    delimiters = whitespace + ',]'
+    # Text kept before ``pos`` when reading more, to show where decoding failed.
+    context = 64
+
+    def __init__(self, chunks, decoder=None):
+        self.chunks = iter(chunks)
+        self.decoder = decoder or json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.exhausted = False
+
+    def read(self):
+        for chunk in self.chunks:
+            if chunk:
+                start = max(self.pos - self.context, 0)
+                self.buffer = self.buffer[start:] + chunk
+                self.pos -= start
+                self.offset += start
+                return True
+        self.exhausted = True
+        return False
+
+    def grow(self):
+        # Read until the unparsed text doubles, so that a large value spanning
+        # many chunks isn't re-parsed from its start once per chunk.
+        target = 2 * (len(self.buffer) - self.pos)
+        grown = False
+        while self.read():
+            grown = True
+            if len(self.buffer) >= target:
+                break
+        return grown
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self.whitespace:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read():
+                return None
+
+    def text(self):
+        # Whatever is left of the document, starting from ``offset``.
+        return self.buffer + ''.join(self.chunks)
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError as e:
+                if not self.grow():
+                    self.pos = getattr(e, 'pos', self.pos)
+                    raise
+                continue
+            # A number cut by the end of a chunk (``12`` of ``123``, ``-1`` of
+            # ``-1.5``) parses fine: only trust it when followed by a delimiter.
+            if not self.exhausted and (end == len(self.buffer) or self.buffer[end] not in self.delimiters):
+                self.grow()
+                continue
+            self.pos = end
+            return value
+
+    def iter_items(self):
+        if self.peek() != '[':
+            raise ValueError("Expecting '['")
+        self.pos += 1
+        char = self.peek()
+        if char == ']':
+            self.pos += 1
+        else:
+            while True:
+                yield self.decode_value()
+                char = self.peek()
+                self.pos += 1
+                if char == ']':
+                    break
+                if char != ',':
+                    self.pos -= 1
+                    raise ValueError("Expecting ',' delimiter or ']'")
+        if self.peek() is not None:
+            raise ValueError("Extra data")
@@ -30,8 +30,15 @@ setup(
     install_requires=[
         "genericclient-base==1.4.2",
         "requests>=2.13.0",
+        'futures; python_version < "3"',
     ],
-    test_suite='tests',
+    extras_require={
+        'aio': ["aiohttp>=3.3"],
+        'numpy': ["numpy"],
+        'arrow': ["pyarrow"],
+        'tracing': ["opentelemetry-api"],
+    },
+    test_suite='tests.suite',
     tests_require=[
         "responses==0.8.1",
     ]
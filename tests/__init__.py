@@ -0,0 +1,14 @@
+import os
+import sys
+import unittest
+
+# ``genericclient.aio`` and its tests use ``async`` syntax, which needs Python 3.7+.
+SKIPPED = () if sys.version_info >= (3, 7) else ('test_aio',)
+
+
+def suite():
+    names = sorted(
+        name[:-3] for name in os.listdir(os.path.dirname(os.path.abspath(__file__)))
+        if name.startswith('test') and name.endswith('.py') and name[:-3] not in SKIPPED
+    )
+    return unittest.TestLoader().loadTestsFromNames(['tests.' + name for name in names])
@@ -0,0 +1,4 @@
+import sys
+
+# See ``tests.SKIPPED``.
+collect_ignore = [] if sys.version_info >= (3, 7) else ['test_aio.py']
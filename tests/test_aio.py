@@ -0,0 +1,219 @@
+import asyncio
+import json
+from unittest import TestCase, skipIf
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    web = None
+
+from genericclient import pagination
+
+
+USERS = [
+    {'id': 1, 'username': 'user1', 'group': 'watchers'},
+    {'id': 2, 'username': 'user2', 'group': 'watchers'},
+    {'id': 3, 'username': 'user3', 'group': 'admin'},
+]
+
+
+async def list_users(request):
+    users = [user for user in USERS if request.query.get('group', user['group']) == user['group']]
+    if 'group__in' in request.query:
+        groups = request.query.getall('group__in')
+        users = [user for user in users if user['group'] in groups]
+    if 'paginate' not in request.query:
+        return web.json_response(users)
+    page = int(request.query.get('page', 1))
+    headers = {}
+    if page < len(users):
+        headers['Link'] = '<{}>; rel=next'.format(request.url.update_query(page=page + 1))
+    return web.json_response(users[page - 1:page], headers=headers)
+
+
+async def get_user(request):
+    pk = int(request.match_info['pk'])
+    for user in USERS:
+        if user['id'] == pk:
+            return web.json_response(user)
+    return web.json_response({'detail': 'Not found.'}, status=404)
+
+
+async def create_user(request):
+    payload = await request.json()
+    if 'username' not in payload:
+        return web.json_response({'username': ['This field is required.']}, status=400)
+    return web.json_response(dict(payload, id=4), status=201)
+
+
+async def update_user(request):
+    payload = await request.json()
+    return web.json_response(payload)
+
+
+async def delete_user(request):
+    if request.match_info['pk'] == '1':
+        return web.Response(status=204)
+    return web.Response(status=404)
+
+
+async def echo(request):
+    return web.Response(body=await request.read() or b'{}', content_type='application/json')
+
+
+async def secret(request):
+    return web.Response(status=401)
+
+
+async def invalid(request):
+    return web.Response(body=b'[not json]')
+
+
+def make_app():
+    app = web.Application()
+    app.router.add_get('/users', list_users)
+    app.router.add_post('/users', create_user)
+    app.router.add_get('/users/{pk}', get_user)
+    app.router.add_put('/users/{pk}', update_user)
+    app.router.add_delete('/users/{pk}', delete_user)
+    app.router.add_route('*', '/users/notify', echo)
+    app.router.add_route('*', '/users/{pk}/notify', echo)
+    app.router.add_get('/secret', secret)
+    app.router.add_post('/invalid/notify', invalid)
+    return app
+
+
+@skipIf(web is None, "aiohttp is not installed")
+class AsyncClientTestCase(TestCase):
+
+    def run_with_client(self, coro, **kwargs):
+        from genericclient.aio import AsyncGenericClient
+
+        async def main():
+            server = TestServer(make_app())
+            await server.start_server()
+            try:
+                async with AsyncGenericClient(str(server.make_url('/')), **kwargs) as client:
+                    return await coro(client)
+            finally:
+                await server.close()
+
+        return asyncio.run(main())
+
+    def test_all_filter(self):
+        async def run(client):
+            users = await client.users.all()
+            self.assertEqual([user.id for user in users], [1, 2, 3])
+            self.assertEqual(users.response.status_code, 200)
+
+            users = await client.users.filter(group__in=['watchers', 'admin'], group='admin')
+            self.assertEqual([user.username for user in users], ['user3'])
+
+        self.run_with_client(run)
+
+    def test_get(self):
+        async def run(client):
+            user = await client.users.get(id=2)
+            self.assertEqual(user.username, 'user2')
+
+            with self.assertRaises(client.ResourceNotFound):
+                await client.users.get(id=9999)
+            with self.assertRaises(client.MultipleResourcesFound):
+                await client.users.get(group='watchers')
+            admin = await client.users.get(group='admin')
+            self.assertEqual(admin.id, 3)
+
+        self.run_with_client(run)
+
+    def test_create_save_delete(self):
+        async def run(client):
+            user = await client.users.create({'username': 'user4'})
+            self.assertEqual(user.id, 4)
+
+            user.username = 'renamed'
+            await user.save()
+            self.assertEqual(user.payload, {'id': 4, 'username': 'renamed'})
+
+            await client.users.delete(1)
+            with self.assertRaises(client.ResourceNotFound):
+                await client.users.delete(2)
+
+            with self.assertRaises(client.BadRequestError):
+                await client.users.create({})
+
+        self.run_with_client(run)
+
+    def test_routes(self):
+        async def run(client):
+            response = await client.users(id=2).notify(unread=3)
+            self.assertEqual(response.data, {'unread': 3})
+
+            response = await client.users(_method='put').notify(unread=3)
+            self.assertEqual(response.data, {'unread': 3})
+
+        self.run_with_client(run)
+
+    def test_paginate(self):
+        async def run(client):
+            users = await client.users.filter(paginate=True)
+            self.assertEqual([user.id for user in users], [1, 2, 3])
+            self.assertEqual(users.response.links, {})
+
+            users = [user.id async for user in client.users.iter_filter(paginate=True)]
+            self.assertEqual(users, [1, 2, 3])
+
+        self.run_with_client(run, autopaginate=pagination.link_header)
+
+    def test_async_paginators(self):
+        from genericclient.aio import AsyncGenericClient, iter_link_header, link_header
+
+        class Pages(object):
+            async def iter_pages(self, endpoint, params):
+                async for page in iter_link_header(endpoint, params):
+                    yield page
+
+        async def paginate(endpoint, params):
+            return await link_header(endpoint, params)
+
+        for paginator in (pagination.PrefetchLinkHeader(), pagination.OffsetLimit(), pagination.iter_link_header):
+            with self.assertRaises(ValueError):
+                AsyncGenericClient('http://dummy.org', autopaginate=paginator)
+        for paginator in (pagination.link_header, link_header, paginate, Pages()):
+            AsyncGenericClient('http://dummy.org', autopaginate=paginator)
+
+        async def run(client):
+            users = await client.users.filter(paginate=True)
+            self.assertEqual([user.id for user in users], [1, 2, 3])
+            self.assertEqual(users.response.links, {})
+
+            users = [user.id async for user in client.users.iter_filter(paginate=True)]
+            self.assertEqual(users, [1, 2, 3])
+
+        self.run_with_client(run, autopaginate=paginate)
+        self.run_with_client(run, autopaginate=Pages())
+
+    def test_errors(self):
+        async def run(client):
+            with self.assertRaises(client.NotAuthenticatedError) as excinfo:
+                await client['secret'].all()
+            self.assertIn('myusername', str(excinfo.exception))
+
+            with self.assertRaises(ValueError) as excinfo:
+                await client.invalid().notify()
+            self.assertIn('[not json]', str(excinfo.exception))
+
+        self.run_with_client(run, auth=('myusername', 'password'))
+
+
+@skipIf(web is None, "aiohttp is not installed")
+class EncodeParamsTestCase(TestCase):
+    def test_encode_params(self):
+        from genericclient.aio import encode_params
+
+        self.assertEqual(
+            encode_params({'a': [1, 'b'], 'c': True, 'd': None, 'e': 1.5}),
+            [('a', 1), ('a', 'b'), ('c', 'True'), ('e', 1.5)],
+        )
+        self.assertIsNone(encode_params({}))
+        self.assertEqual(json.loads(json.dumps(encode_params({'x': 'y'}))), [['x', 'y']])
@@ -0,0 +1,92 @@
+import json
+import threading
+from unittest import TestCase
+
+import responses
+
+from genericclient import GenericClient, ParsedResponse
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+generic_client = GenericClient(url=MOCK_API_URL, thread_safe=True)
+
+
+def request_callback(request):
+    return (200, {}, request.body)
+
+
+class BatchTestCase(TestCase):
+
+    def test_routes(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.POST, MOCK_API_URL + '/posts/1/publish', callback=request_callback)
+            rsps.add_callback(responses.POST, MOCK_API_URL + '/posts/2/publish', callback=request_callback)
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/blogs/ping', callback=request_callback)
+
+            with generic_client.batch(max_workers=3) as batch:
+                futures = [batch.posts(id=pk).publish(date=pk) for pk in (1, 2)]
+                ping = batch.blogs(_method='get').ping()
+                self.assertEqual(len(rsps.calls), 0)
+
+            self.assertEqual(len(rsps.calls), 3)
+            self.assertIsInstance(ping.result(), ParsedResponse)
+            self.assertEqual([future.result().data for future in futures], [{'date': 1}, {'date': 2}])
+
+    def test_endpoints(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1, 'username': 'user1'})
+            rsps.add(responses.GET, MOCK_API_URL + '/users/2', status=404)
+            rsps.add(responses.GET, MOCK_API_URL + '/groups', json=[{'id': 1}, {'id': 2}])
+
+            with generic_client.batch() as batch:
+                user = batch.users.get(id=1)
+                missing = batch['users'].get(id=2)
+                groups = batch.groups.all()
+
+            self.assertEqual(user.result().username, 'user1')
+            self.assertEqual(len(groups.result()), 2)
+            self.assertIsInstance(missing.exception(), generic_client.ResourceNotFound)
+            with self.assertRaises(generic_client.ResourceNotFound):
+                missing.result()
+
+    def test_concurrent(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def callback(request):
+            barrier.wait()
+            return (200, {}, json.dumps({'id': int(request.url.rsplit('/', 1)[-1])}))
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users/1', callback=callback)
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users/2', callback=callback)
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users/3', callback=callback)
+
+            with generic_client.batch(max_workers=3) as batch:
+                futures = [batch.users.get(id=pk) for pk in (1, 2, 3)]
+
+            self.assertEqual([future.result().id for future in futures], [1, 2, 3])
+
+    def test_result_flushes(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1})
+            rsps.add(responses.GET, MOCK_API_URL + '/users/2', json={'id': 2})
+
+            with generic_client.batch() as batch:
+                first = batch.users.get(id=1)
+                self.assertEqual(first.result().id, 1)
+                second = batch.users.get(id=2)
+                self.assertFalse(second.done())
+
+            self.assertEqual(second.result().id, 2)
+
+    def test_error_cancels_pending(self):
+        with responses.RequestsMock():
+            with self.assertRaises(ZeroDivisionError):
+                with generic_client.batch() as batch:
+                    future = batch.users.get(id=1)
+                    1 / 0
+
+            self.assertTrue(future.cancelled())
+            with self.assertRaises(RuntimeError):
+                batch.users.get(id=1)
@@ -0,0 +1,84 @@
+import json
+from unittest import TestCase
+
+import responses
+
+from genericclient import Endpoint, GenericClient
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class BulkEndpoint(Endpoint):
+    bulk_url = 'bulk'
+    bulk_chunk_size = 2
+
+
+class BulkClient(GenericClient):
+    endpoint_classes = {
+        'items': BulkEndpoint,
+    }
+
+
+generic_client = BulkClient(url=MOCK_API_URL)
+
+
+def bulk_callback(request):
+    payloads = json.loads(request.body)
+    if any('name' not in payload for payload in payloads):
+        return (400, {}, json.dumps({'name': ['This field is required.']}))
+    return (201, {}, json.dumps([dict(payload, id=payload['name']) for payload in payloads]))
+
+
+class BulkTestCase(TestCase):
+
+    def test_get_many(self):
+        with responses.RequestsMock() as rsps:
+            for pk in (1, 2, 4):
+                rsps.add(responses.GET, MOCK_API_URL + '/users/{}'.format(pk), json={'id': pk})
+            rsps.add(responses.GET, MOCK_API_URL + '/users/3', status=404)
+
+            results = generic_client.users.get_many([{'id': pk} for pk in (1, 2, 3, 4)], max_workers=3)
+            self.assertEqual([result.ok for result in results], [True, True, False, True])
+            self.assertEqual(results[0].result().id, 1)
+            self.assertEqual(results[3].value.id, 4)
+            self.assertEqual(results[2].item, {'id': 3})
+            self.assertIsInstance(results[2].exception, generic_client.ResourceNotFound)
+            with self.assertRaises(generic_client.ResourceNotFound):
+                results[2].result()
+
+    def test_create_many(self):
+        def callback(request):
+            payload = json.loads(request.body)
+            return (201, {}, json.dumps(dict(payload, id=payload['name'])))
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.POST, MOCK_API_URL + '/users', callback=callback)
+
+            results = generic_client.users.create_many([{'name': name} for name in 'abc'])
+            self.assertEqual([result.result().id for result in results], ['a', 'b', 'c'])
+
+    def test_delete_many(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.DELETE, MOCK_API_URL + '/users/1', status=204)
+            rsps.add(responses.DELETE, MOCK_API_URL + '/users/2', status=404)
+
+            results = generic_client.users.delete_many([1, 2])
+            self.assertTrue(results[0].ok)
+            self.assertIsNone(results[0].value)
+            self.assertIsInstance(results[1].exception, generic_client.ResourceNotFound)
+
+        self.assertEqual(generic_client.users.delete_many([]), [])
+
+    def test_create_many_bulk(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.POST, MOCK_API_URL + '/items/bulk', callback=bulk_callback)
+
+            payloads = [{'name': 'a'}, {'name': 'b'}, {}, {'name': 'd'}, {'name': 'e'}]
+            results = generic_client.items.create_many(payloads)
+            self.assertEqual(len(rsps.calls), 3)
+            self.assertEqual([result.ok for result in results], [True, True, False, False, True])
+            self.assertEqual(results[1].value.id, 'b')
+            self.assertEqual(results[4].value.id, 'e')
+            self.assertIsInstance(results[3].exception, generic_client.BadRequestError)
+            self.assertEqual(results[3].item, {'name': 'd'})
@@ -0,0 +1,196 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import responses
+
+from genericclient import GenericClient
+from genericclient.cache import CacheEntry, MemoryCache, SQLiteCache, cache_key
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class CacheTestCase(TestCase):
+
+    def make_client(self, **kwargs):
+        return GenericClient(url=MOCK_API_URL, cache=MemoryCache(**kwargs))
+
+    def test_max_age(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1}, headers={
+                'Cache-Control': 'public, max-age=60',
+            })
+
+            self.assertEqual(client.users.get(id=1).id, 1)
+            self.assertEqual(client.users.get(id=1).id, 1)
+            self.assertEqual(len(rsps.calls), 1)
+
+    def test_isolated_hits(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1, 'groups': ['watchers']}, headers={
+                'Cache-Control': 'max-age=60',
+            })
+
+            user = client.users.get(id=1)
+            user.groups.append('admins')
+            user = client.users.get(id=1)
+            self.assertEqual(user.groups, ['watchers'])
+            user.groups.append('editors')
+            self.assertEqual(client.users.get(id=1).groups, ['watchers'])
+            self.assertEqual(len(rsps.calls), 1)
+
+    def test_content(self):
+        client = GenericClient(url=MOCK_API_URL, cache=MemoryCache(), stream_json=True)
+        body = u'[{"id": 1, "name": "caf\u00e9"}]'
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', body=body.encode('latin-1'), headers={
+                'Content-Type': 'application/json; charset=iso-8859-1',
+                'Cache-Control': 'max-age=60',
+            })
+
+            self.assertEqual(client.users.all()[0].name, u'caf\u00e9')
+            self.assertEqual(client.users.all()[0].name, u'caf\u00e9')
+            self.assertEqual(len(rsps.calls), 1)
+            self.assertEqual(client._cache.size, len(body.encode('utf-8')))
+
+    def test_params(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}], headers={
+                'Cache-Control': 'max-age=60',
+            })
+
+            client.users.filter(group='watchers', active=True)
+            client.users.filter(active=True, group='watchers')
+            self.assertEqual(len(rsps.calls), 1)
+            client.users.filter(group='admins')
+            client.users.all()
+            self.assertEqual(len(rsps.calls), 3)
+
+    def test_revalidate(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}], headers={
+                'ETag': '"v1"',
+                'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT',
+            })
+            users = client.users.all()
+            self.assertEqual(len(users), 1)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', status=304, headers={
+                'Cache-Control': 'max-age=60',
+            })
+            users = client.users.all()
+            self.assertEqual(users[0].id, 1)
+            self.assertEqual(users.response.status_code, 200)
+            request = rsps.calls[0].request
+            self.assertEqual(request.headers['If-None-Match'], '"v1"')
+            self.assertEqual(request.headers['If-Modified-Since'], 'Wed, 21 Oct 2015 07:28:00 GMT')
+
+            # now fresh, for 60 seconds
+            self.assertEqual(client.users.all()[0].id, 1)
+            self.assertEqual(len(rsps.calls), 1)
+
+    def test_not_cacheable(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[], headers={
+                'Cache-Control': 'no-store, max-age=60',
+            })
+            rsps.add(responses.GET, MOCK_API_URL + '/groups', json=[])
+
+            client.users.all()
+            client.users.all()
+            client.groups.all()
+            client.groups.all()
+            self.assertEqual(len(rsps.calls), 4)
+            self.assertEqual(len(client._cache), 0)
+
+    def test_default_ttl(self):
+        client = self.make_client(default_ttl=60)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/groups', json=[])
+
+            client.groups.all()
+            client.groups.all()
+            self.assertEqual(len(rsps.calls), 1)
+
+    def test_invalidate(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1, 'group': 'watchers'}, headers={
+                'Cache-Control': 'max-age=60',
+            })
+            rsps.add(responses.PUT, MOCK_API_URL + '/users/1', json={'id': 1, 'group': 'admins'})
+
+            user = client.users.get(id=1)
+            user.group = 'admins'
+            user.save()
+            client.users.get(id=1)
+            self.assertEqual(len(rsps.calls), 3)
+
+    def test_lru(self):
+        cache = MemoryCache(max_entries=2, max_bytes=10)
+        for key, size in (('a', 3), ('b', 3), ('c', 3)):
+            cache.set(key, CacheEntry(200, {}, key.encode('utf-8'), None, size))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b').content, b'b')
+        cache.set('d', CacheEntry(200, {}, b'd', None, 5))
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(cache.get('b').content, b'b')
+        self.assertEqual(cache.size, 8)
+        cache.set('e', CacheEntry(200, {}, b'e', None, 4))
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual((len(cache), cache.size), (2, 7))
+
+    def test_cache_key(self):
+        self.assertEqual(cache_key('http://dummy.org/users'), 'http://dummy.org/users')
+        self.assertEqual(
+            cache_key('http://dummy.org/users', {'b': [1, 2], 'a': 'x'}),
+            'http://dummy.org/users?a=x&b=1&b=2',
+        )
+
+
+class SQLiteCacheTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_persistent(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1}, headers={
+                'Cache-Control': 'max-age=60',
+            })
+            cache = SQLiteCache(self.path)
+            GenericClient(url=MOCK_API_URL, cache=cache).users.get(id=1)
+            cache.close()
+
+            cache = SQLiteCache(self.path)
+            user = GenericClient(url=MOCK_API_URL, cache=cache).users.get(id=1)
+            self.assertEqual(user.id, 1)
+            self.assertEqual(user.response.headers['cache-control'], 'max-age=60')
+            self.assertEqual(len(rsps.calls), 1)
+            cache.close()
+
+    def test_lru(self):
+        cache = SQLiteCache(self.path, max_entries=2, max_bytes=10)
+        for key, size in (('a', 3), ('b', 3), ('c', 3)):
+            cache.set(key, CacheEntry(200, {}, key.encode('utf-8'), None, size))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b').content, b'b')
+        cache.set('d', CacheEntry(200, {}, b'd', None, 5))
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual((len(cache), cache.size), (2, 8))
+        cache.delete('b')
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        cache.close()
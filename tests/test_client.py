@@ -1,8 +1,11 @@
+import socket
 from unittest import TestCase
 
 import responses
 
-from genericclient import GenericClient
+from genericclient import Endpoint, GenericClient
+from genericclient.metrics import Metrics
+from genericclient.adapters import PooledAdapter
 
 
 class RequestClientTestCase(TestCase):
@@ -20,6 +23,12 @@ class RequestClientTestCase(TestCase):
         client = GenericClient(url='http://dummy.org/api')
         self.assertEqual(client.host, 'dummy.org')
 
+    def test_options_dont_hide_endpoints(self):
+        client = GenericClient(url='http://dummy.org', cache=object(), retry=3, timeout=5, metrics=Metrics())
+        for name in ('hooks', 'cache', 'metrics', 'retry', 'timeout', 'deadline', 'compression', 'tracer', 'emit'):
+            self.assertIsInstance(getattr(client, name), Endpoint)
+            self.assertEqual(getattr(client, name).url, 'http://dummy.org/' + name)
+
     def test_session(self):
         client = GenericClient(url='http://dummy.org', auth=('username', 'password'))
         self.assertEqual(client.session.auth[0], 'username')
@@ -37,4 +46,115 @@ class RequestClientTestCase(TestCase):
             with self.assertRaises(ValueError) as excinfo:
                 client.users.all()
 
-            assert '[not json]' in str(excinfo.exception)
+            self.assertEqual(str(excinfo.exception), 'Response from server is not valid JSON. Received 200: [not json]')
+
+    def test_stream_json(self):
+        client = GenericClient(url='http://dummy.org', stream_json=True)
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                'http://dummy.org/users',
+                body=u' [{"id": 1, "name": "\u00e8"}, {"id": 22}, 333 ] ',
+                headers={'Content-Type': 'application/json'},
+            )
+            rsps.add(
+                responses.GET,
+                'http://dummy.org/users/1',
+                json={'id': 1},
+            )
+            rsps.add(
+                responses.DELETE,
+                'http://dummy.org/users/1',
+                status=204,
+            )
+
+            response = client.users.request('get', 'http://dummy.org/users')
+            self.assertEqual(response.data, [{'id': 1, 'name': u'\u00e8'}, {'id': 22}, 333])
+            self.assertEqual(client.users.get(id=1).id, 1)
+            client.users.delete(1)
+
+    def test_stream_invalid_data(self):
+        client = GenericClient(url='http://dummy.org', stream_json=True)
+        for body in ('[not json]', '[{"id": 1}, ]', '[{"id": 1}] []', '{"id": 1'):
+            with responses.RequestsMock() as rsps:
+                rsps.add(
+                    responses.GET,
+                    'http://dummy.org/users',
+                    body=body,
+                    headers={'Content-Type': 'application/json'},
+                )
+
+                with self.assertRaises(ValueError) as excinfo:
+                    client.users.all()
+
+                assert body in str(excinfo.exception)
+
+    def test_stream_iter_filter(self):
+        client = GenericClient(url='http://dummy.org', stream_json=True)
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                'http://dummy.org/users',
+                body='[{"id": 1}, {"id": 2}, not json]',
+                headers={'Content-Type': 'application/json'},
+            )
+
+            # Resources come as they are decoded, before the invalid item is reached.
+            users = client.users.iter_filter(_limit=2)
+            self.assertEqual([user.id for user in users], [1, 2])
+            users = client.users.iter_filter()
+            self.assertEqual(next(users).id, 1)
+            self.assertEqual(next(users).id, 2)
+            with self.assertRaises(ValueError):
+                next(users)
+
+    def test_invalid_data_offset(self):
+        body = '[' + '{"id": 1}, ' * 100 + '{"id": oops}]'
+        client = GenericClient(url='http://dummy.org', stream_json=True)
+        client._stream_chunk_size = 7
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                'http://dummy.org/users',
+                body=body,
+                headers={'Content-Type': 'application/json'},
+            )
+
+            with self.assertRaises(ValueError) as excinfo:
+                client.users.all()
+
+            message = str(excinfo.exception)
+            self.assertIn('at offset {}:'.format(body.index('oops')), message)
+            self.assertIn('{"id": 1}, {"id": oops}]', message)
+            self.assertLess(len(message), 200)
+
+    def test_pool_options(self):
+        client = GenericClient(
+            url='http://dummy.org', pool_connections=2, pool_maxsize=64, pool_block=True,
+            keep_alive=False, tcp_keepalive=True,
+        )
+        for prefix in ('http://', 'https://'):
+            adapter = client.session.get_adapter(prefix + 'dummy.org')
+            self.assertIsInstance(adapter, PooledAdapter)
+            self.assertEqual(adapter.poolmanager.connection_pool_kw['maxsize'], 64)
+            self.assertEqual(adapter.poolmanager.connection_pool_kw['block'], True)
+            self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), adapter.socket_options)
+            self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), adapter.socket_options)
+        self.assertEqual(client.session.headers['Connection'], 'close')
+
+        adapter = GenericClient(url='http://dummy.org', tcp_nodelay=False)._make_adapter()
+        self.assertNotIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), adapter.socket_options)
+
+    def test_shared_adapter(self):
+        adapter = PooledAdapter(pool_maxsize=32)
+        client1 = GenericClient(url='http://dummy.org/api', adapter=adapter)
+        client2 = GenericClient(url='http://dummy.org/other', adapter=adapter)
+        self.assertIs(client1.session.get_adapter('http://dummy.org/api/users'), adapter)
+        self.assertIs(client2.session.get_adapter('http://dummy.org/other/users'), adapter)
+
+        client = GenericClient(url='http://dummy.org', adapter=PooledAdapter)
+        self.assertIsInstance(client.session.get_adapter('http://dummy.org/users'), PooledAdapter)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'http://dummy.org/api/users', json=[])
+            self.assertEqual(len(client1.users.all()), 0)
@@ -0,0 +1,106 @@
+import unittest
+from unittest import TestCase
+
+import responses
+
+from genericclient import CompactResource, Endpoint, GenericClient, LazyResourceSet
+from genericclient.columns import ColumnBuilder
+from genericclient.pagination import link_header
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class EventEndpoint(Endpoint):
+    resource_class = CompactResource
+    resource_set_class = LazyResourceSet
+
+
+class Client(GenericClient):
+    endpoint_classes = {
+        'events': EventEndpoint,
+    }
+
+
+class ColumnsTestCase(TestCase):
+
+    def test_builder(self):
+        builder = ColumnBuilder()
+        builder.extend([{'id': 1, 'name': 'a'}, {'id': 2}])
+        builder.extend([])
+        builder.extend([{'id': 3, 'score': 1.5, 'name': 'c'}])
+        self.assertEqual(builder.build(), {
+            'id': [1, 2, 3],
+            'name': ['a', None, 'c'],
+            'score': [None, None, 1.5],
+        })
+        self.assertEqual(list(builder.build()), ['id', 'name', 'score'])
+
+        with self.assertRaises(ValueError):
+            builder.build('csv')
+
+    def test_filter(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=link_header)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/events?type=click', match_querystring=True, json=[
+                {'id': 1, 'user': 'a'},
+                {'id': 2, 'user': 'b'},
+            ], headers={'link': '<' + MOCK_API_URL + '/events?type=click&page=2>; rel=next'})
+            rsps.add(responses.GET, MOCK_API_URL + '/events?type=click&page=2', match_querystring=True, json=[
+                {'id': 3, 'user': 'c'},
+            ])
+
+            events = client.events.filter(type='click', _as='columns')
+            self.assertEqual(events, {'id': [1, 2, 3], 'user': ['a', 'b', 'c']})
+            self.assertEqual(events.response.status_code, 200)
+            self.assertEqual(len(rsps.calls), 2)
+
+    def test_all(self):
+        client = GenericClient(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/events', json=[])
+
+            self.assertEqual(client.events.all(_as='columns'), {})
+
+            with self.assertRaises(ValueError):
+                client.events.all(_as='csv')
+            self.assertEqual(len(rsps.calls), 1)
+
+    def test_to_columns(self):
+        client = Client(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/events', json=[{'id': 1}, {'id': 2}])
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}, {'id': 2}])
+
+            events = client.events.all()
+            events[0].id = 10
+            self.assertEqual(events.to_columns(), {'id': [10, 2]})
+            self.assertIsInstance(list.__getitem__(events, 1), dict)
+
+            self.assertEqual(client.users.all().to_columns(), {'id': [1, 2]})
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        columns = ColumnBuilder()
+        columns.extend([{'id': 1, 'score': 0.5}, {'id': 2, 'score': 1.5}])
+        columns = columns.build('numpy')
+        self.assertEqual(columns['id'].tolist(), [1, 2])
+        self.assertEqual(columns['score'].sum(), 2.0)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow(self):
+        columns = ColumnBuilder()
+        columns.extend([{'id': 1, 'score': 0.5}, {'id': 2, 'score': 1.5}])
+        table = columns.build('arrow')
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column('id').to_pylist(), [1, 2])
@@ -0,0 +1,137 @@
+import json
+from unittest import TestCase
+
+import responses
+
+from genericclient import CompactResource, Endpoint, GenericClient, LazyResourceSet
+from genericclient.cache import MemoryCache
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class UserEndpoint(Endpoint):
+    resource_class = CompactResource
+    resource_set_class = LazyResourceSet
+
+
+class Client(GenericClient):
+    endpoint_classes = {
+        'users': UserEndpoint,
+    }
+
+
+class CompactResourceTestCase(TestCase):
+
+    def test_empty_dict(self):
+        resource = CompactResource.wrap(None, {'id': 1})
+        resource.username = 'user1'
+        self.assertEqual(resource.id, 1)
+        self.assertEqual(resource.payload, {'id': 1, 'username': 'user1'})
+        self.assertEqual(vars(resource), {})
+
+    def test_lazy(self):
+        client = Client(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[
+                {'id': 1, 'username': 'user1'},
+                {'id': 2, 'username': 'user2'},
+                {'id': 3, 'username': 'user3'},
+            ])
+
+            users = client.users.all()
+
+        self.assertIsInstance(users, list)
+        self.assertEqual(len(users), 3)
+        self.assertIsInstance(list.__getitem__(users, 1), dict)
+
+        user = users[1]
+        self.assertIsInstance(user, CompactResource)
+        self.assertEqual(user.username, 'user2')
+        self.assertIs(users[1], user)
+        self.assertIsInstance(list.__getitem__(users, 0), dict)
+
+        self.assertEqual([u.id for u in users], [1, 2, 3])
+        self.assertEqual([u.id for u in reversed(users)], [3, 2, 1])
+        self.assertEqual([u.id for u in users[1:]], [2, 3])
+        self.assertIn(user, users)
+        self.assertEqual(users.index(user), 1)
+        with self.assertRaises(AttributeError):
+            user.email
+
+    def test_lazy_list_operations(self):
+        client = Client(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}, {'id': 2}])
+
+            def fetch():
+                return client.users.all()
+
+            for result in (
+                [] + fetch(), fetch() + [], fetch() * 2, 2 * fetch(), list(fetch()), tuple(fetch()), sorted(fetch(), key=id),
+                fetch().copy(), fetch()[:], [user for user in fetch()],
+            ):
+                self.assertTrue(all(isinstance(user, CompactResource) for user in result))
+
+            users = fetch()
+            users *= 2
+            self.assertEqual([user.id for user in list.__iter__(users)], [1, 2, 1, 2])
+            self.assertIs(users[0], users[2])
+
+            users = fetch()
+            self.assertFalse([] > users)
+            self.assertTrue(users > [])
+            self.assertTrue(all(isinstance(user, CompactResource) for user in list.__iter__(users)))
+
+    def test_copy_on_write(self):
+        client = Client(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1, 'username': 'user1'}])
+
+            users = client.users.all()
+
+        data = users.response.data[0]
+        user = users[0]
+        self.assertIs(user._payload, data)
+
+        user.username = 'user2'
+        self.assertEqual(user.username, 'user2')
+        self.assertEqual(data['username'], 'user1')
+        self.assertEqual(user.payload, {'id': 1, 'username': 'user2'})
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.PUT, MOCK_API_URL + '/users/1', json={'id': 1, 'username': 'user2'})
+            user.save()
+            self.assertEqual(json.loads(rsps.calls[0].request.body), {'id': 1, 'username': 'user2'})
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.DELETE, MOCK_API_URL + '/users/1', status=204)
+            user.delete()
+
+    def test_cache_not_modified(self):
+        client = Client(url=MOCK_API_URL, cache=MemoryCache(default_ttl=60))
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1, 'username': 'user1'}])
+
+            users = client.users.all()
+            users[0].username = 'user2'
+            self.assertEqual(client.users.all()[0].username, 'user1')
+
+    def test_get(self):
+        client = Client(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1, 'username': 'user1'})
+
+            user = client.users.get(id=1)
+            self.assertIsInstance(user, CompactResource)
+            self.assertEqual(user.pk, 1)
+            self.assertEqual(user, CompactResource.wrap(client.users, {'id': 1, 'username': 'user1'}))
+
+    def test_iter_all(self):
+        client = Client(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}, {'id': 2}])
+
+            users = list(client.users.iter_all())
+            self.assertIsInstance(users[0], CompactResource)
+            self.assertEqual([user.pk for user in users], [1, 2])
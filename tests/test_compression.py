@@ -0,0 +1,64 @@
+import gzip
+import io
+import json
+import zlib
+from unittest import TestCase
+
+import responses
+
+from genericclient import GenericClient
+from genericclient.compression import accept_encoding, available_encodings, compress
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class CompressionTestCase(TestCase):
+
+    def test_accept_encoding(self):
+        self.assertIn('gzip', available_encodings())
+        self.assertEqual(accept_encoding(False), 'identity')
+        self.assertEqual(accept_encoding(['gzip', 'unknown']), 'gzip')
+        self.assertEqual(accept_encoding(['unknown']), 'identity')
+
+        self.assertEqual(GenericClient(url=MOCK_API_URL).session.headers['Accept-Encoding'], accept_encoding())
+        client = GenericClient(url=MOCK_API_URL, compression=False)
+        self.assertEqual(client.session.headers['Accept-Encoding'], 'identity')
+
+    def test_compress(self):
+        data = b'{"id": 1}' * 100
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(compress(data))).read(), data)
+        self.assertEqual(zlib.decompress(compress(data, 'deflate')), data)
+        with self.assertRaises(ValueError):
+            GenericClient(url=MOCK_API_URL, compress_min_size=0, compress_encoding='lzma')
+
+    def test_request(self):
+        client = GenericClient(url=MOCK_API_URL, compress_min_size=1024)
+        payload = {'id': 1, 'bio': 'x' * 2048}
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.PUT, MOCK_API_URL + '/users/1', json={'id': 1})
+            rsps.add(responses.POST, MOCK_API_URL + '/users', json={'id': 2}, status=201)
+
+            client.users.create_or_update(payload)
+            request = rsps.calls[0].request
+            self.assertEqual(request.headers['Content-Encoding'], 'gzip')
+            self.assertEqual(request.headers['Content-Type'], 'application/json')
+            self.assertEqual(json.loads(zlib.decompress(request.body, 16 + zlib.MAX_WBITS)), payload)
+
+            client.users.create({'username': 'user2'})
+            request = rsps.calls[1].request
+            self.assertNotIn('Content-Encoding', request.headers)
+            self.assertEqual(json.loads(request.body), {'username': 'user2'})
+
+    def test_response(self):
+        body = compress(json.dumps([{'id': i} for i in range(100)]).encode('utf-8'))
+        for stream_json in (False, True):
+            client = GenericClient(url=MOCK_API_URL, stream_json=stream_json)
+            with responses.RequestsMock() as rsps:
+                rsps.add(responses.GET, MOCK_API_URL + '/users', body=body, headers={
+                    'Content-Encoding': 'gzip',
+                    'Content-Type': 'application/json',
+                })
+
+                users = client.users.all()
+                self.assertEqual([user.id for user in users], list(range(100)))
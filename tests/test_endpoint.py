@@ -35,6 +35,38 @@ class EndpointTestCase(TestCase):
             users = generic_client.users.all()
             self.assertEqual(len(users), 3)
 
+    def test_endpoint_iter_all(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[
+                {
+                    'id': 1,
+                    'username': 'user1',
+                    'group': 'watchers',
+                },
+                {
+                    'id': 2,
+                    'username': 'user2',
+                    'group': 'watchers',
+                },
+            ])
+
+            users = generic_client.users.iter_all()
+            self.assertEqual(len(rsps.calls), 0)
+            self.assertEqual([user.username for user in users], ['user1', 'user2'])
+
+    def test_endpoint_iter_filter(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users?group=watchers', json=[
+                {
+                    'id': 1,
+                    'username': 'user1',
+                    'group': 'watchers',
+                },
+            ], match_querystring=True)
+
+            users = list(generic_client.users.iter_filter(group="watchers"))
+            self.assertEqual(users[0].username, 'user1')
+
     def test_endpoint_filter(self):
         with responses.RequestsMock() as rsps:
             rsps.add(responses.GET, MOCK_API_URL + '/users', json=[
@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+import responses
+
+from genericclient import GenericClient
+from genericclient.export import JSONLinesSink, SQLiteSink, replace_file
+from genericclient.pagination import OffsetLimit, link_header
+
+try:
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from urlparse import parse_qs, urlparse
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+def link_callback(fail_on=None, link='{}/logs?level=error&page={}'):
+    def callback(request):
+        page = int(parse_qs(urlparse(request.url).query).get('page', ['1'])[0])
+        if page == fail_on:
+            return (500, {}, '')
+        headers = {}
+        if page < 4:
+            headers['link'] = '<{}>; rel=next'.format(link.format(MOCK_API_URL, page + 1))
+        return (200, headers, json.dumps([{'id': page * 10 + i} for i in range(2)]))
+    return callback
+
+
+class ExportTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.client = GenericClient(url=MOCK_API_URL, autopaginate=link_header)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read_lines(self, path):
+        with open(path) as f:
+            return [json.loads(line)['id'] for line in f]
+
+    def test_json_lines(self):
+        path = os.path.join(self.directory, 'logs.jsonl')
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback())
+
+            self.assertEqual(self.client.logs.export(JSONLinesSink(path), level='error'), 8)
+            self.assertEqual(self.read_lines(path), [10, 11, 20, 21, 30, 31, 40, 41])
+
+            # Already done: nothing to request.
+            self.assertEqual(self.client.logs.export(JSONLinesSink(path), level='error'), 8)
+            self.assertEqual(len(rsps.calls), 4)
+
+    def test_json_lines_resume(self):
+        path = os.path.join(self.directory, 'logs.jsonl')
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback(fail_on=3))
+
+            with self.assertRaises(self.client.HTTPError):
+                self.client.logs.export(JSONLinesSink(path), level='error')
+            self.assertEqual(self.read_lines(path), [10, 11, 20, 21])
+
+        with open(path, 'a') as f:
+            f.write('{"id": "partial"')
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback())
+
+            self.assertEqual(self.client.logs.export(JSONLinesSink(path), level='error'), 8)
+            self.assertEqual(self.read_lines(path), [10, 11, 20, 21, 30, 31, 40, 41])
+            self.assertEqual(rsps.calls[0].request.url, MOCK_API_URL + '/logs?level=error&page=2')
+
+    def test_resume_unsorted_link(self):
+        path = os.path.join(self.directory, 'logs.jsonl')
+        link = '{}/logs?status=error&page={}'
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback(3, link))
+
+            with self.assertRaises(self.client.HTTPError):
+                self.client.logs.export(JSONLinesSink(path), status='error')
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback(link=link))
+
+            self.assertEqual(self.client.logs.export(JSONLinesSink(path), status='error'), 8)
+            self.assertEqual(self.read_lines(path), [10, 11, 20, 21, 30, 31, 40, 41])
+
+    def test_other_export(self):
+        path = os.path.join(self.directory, 'logs.jsonl')
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback(fail_on=2))
+
+            with self.assertRaises(self.client.HTTPError):
+                self.client.logs.export(JSONLinesSink(path), level='error')
+
+        with self.assertRaises(ValueError):
+            self.client.logs.export(JSONLinesSink(path), level='warning')
+
+    def test_sqlite_resume(self):
+        path = os.path.join(self.directory, 'export.db')
+        client = GenericClient(url=MOCK_API_URL, autopaginate=OffsetLimit(limit=2, max_workers=1))
+        failing = {'offset': '4'}
+
+        def callback(request):
+            params = {key: values[0] for key, values in parse_qs(urlparse(request.url).query).items()}
+            if params['offset'] == failing.get('offset'):
+                return (500, {}, '')
+            offset = int(params['offset'])
+            return (200, {}, json.dumps({
+                'results': [{'id': i} for i in range(offset, min(offset + 2, 7))], 'count': 7,
+            }))
+
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=callback)
+
+            with self.assertRaises(client.HTTPError):
+                client.logs.export(SQLiteSink(path, table='logs'))
+
+            failing.clear()
+            calls = len(rsps.calls)
+            self.assertEqual(client.logs.export(SQLiteSink(path, table='logs')), 7)
+            self.assertEqual(rsps.calls[calls].request.url, MOCK_API_URL + '/logs?limit=2&offset=2')
+
+        db = sqlite3.connect(path)
+        rows = db.execute('SELECT data FROM logs ORDER BY id').fetchall()
+        self.assertEqual([json.loads(row[0])['id'] for row in rows], list(range(7)))
+        db.close()
+
+    def test_replace_file_without_os_replace(self):
+        src, dst = os.path.join(self.directory, 'new'), os.path.join(self.directory, 'old')
+        for path, content in ((src, 'new'), (dst, 'old')):
+            with open(path, 'w') as f:
+                f.write(content)
+
+        os_replace = getattr(os, 'replace', None)
+        if os_replace is not None:
+            del os.replace
+        try:
+            replace_file(src, dst)
+        finally:
+            if os_replace is not None:
+                os.replace = os_replace
+
+        self.assertFalse(os.path.exists(src))
+        with open(dst) as f:
+            self.assertEqual(f.read(), 'new')
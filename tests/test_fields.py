@@ -0,0 +1,133 @@
+import json
+from unittest import TestCase
+
+import responses
+
+from genericclient import Endpoint, GenericClient
+from genericclient.pagination import link_header
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class ArticleEndpoint(Endpoint):
+    fields_param = 'fields[{name}]'
+
+
+class UserEndpoint(Endpoint):
+    trim_fields = False
+
+
+class Client(GenericClient):
+    endpoint_classes = {
+        'articles': ArticleEndpoint,
+        'users': UserEndpoint,
+    }
+
+
+class FieldsTestCase(TestCase):
+
+    def test_filter(self):
+        client = GenericClient(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users?group=watchers&fields=id,username', match_querystring=True, json=[
+                {'id': 1, 'username': 'user1', 'email': 'user1@example.com'},
+                {'id': 2, 'username': 'user2'},
+            ])
+
+            users = client.users.filter(group='watchers', _fields=['id', 'username'])
+            self.assertEqual([user.payload for user in users], [
+                {'id': 1, 'username': 'user1'},
+                {'id': 2, 'username': 'user2'},
+            ])
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.PATCH, MOCK_API_URL + '/users/1', json={
+                'id': 1, 'username': 'user3', 'email': 'user1@example.com',
+            })
+            users[0].username = 'user3'
+            users[0].save()
+            self.assertEqual(rsps.calls[0].request.url, MOCK_API_URL + '/users/1')
+            self.assertEqual(json.loads(rsps.calls[0].request.body), {'username': 'user3'})
+            self.assertIsNone(users[0]._dirty)
+
+    def test_get(self):
+        client = GenericClient(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1?fields=username,id', match_querystring=True, json={
+                'id': 1, 'username': 'user1', 'email': 'user1@example.com',
+            })
+
+            user = client.users.get(id=1, _fields='username')
+            self.assertEqual(user.payload, {'username': 'user1', 'id': 1})
+            self.assertEqual(user._dirty, set())
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.PATCH, MOCK_API_URL + '/users/1', json={'id': 1, 'username': 'user2'})
+            user.username = 'user2'
+            user.save()
+            self.assertEqual(json.loads(rsps.calls[0].request.body), {'username': 'user2'})
+
+    def test_payload_names(self):
+        client = GenericClient(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1?fields=changes,partial,id', match_querystring=True, json={
+                'id': 1, 'changes': 3, 'partial': True,
+            })
+            rsps.add(responses.PATCH, MOCK_API_URL + '/users/1', json={'id': 1, 'changes': 4, 'partial': True})
+
+            user = client.users.get(id=1, _fields=['changes', 'partial'])
+            self.assertEqual((user.changes, user.partial), (3, True))
+            user.changes += 1
+            user.save()
+            self.assertEqual(json.loads(rsps.calls[1].request.body), {'changes': 4})
+
+    def test_save_without_pk(self):
+        client = GenericClient(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users?fields=username,id', match_querystring=True, json=[
+                {'username': 'user1'},
+            ])
+
+            user = client.users.all(_fields=['username'])[0]
+
+        with self.assertRaises(client.UnknownPK):
+            user.save()
+
+    def test_not_partial(self):
+        client = GenericClient(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1, 'username': 'user1'})
+            self.assertIsNone(client.users.get(id=1)._dirty)
+
+    def test_paginate(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=link_header)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users?fields=id', match_querystring=True, json=[
+                {'id': 1, 'username': 'user1'},
+            ], headers={'link': '<' + MOCK_API_URL + '/users?fields=id&page=2>; rel=next'})
+            rsps.add(responses.GET, MOCK_API_URL + '/users?fields=id&page=2', match_querystring=True, json=[
+                {'id': 2, 'username': 'user2'},
+            ])
+
+            users = client.users.all(_fields=['id'])
+            self.assertEqual([user.payload for user in users], [{'id': 1}, {'id': 2}])
+
+            columns = client.users.all(_fields=['id'], _as='columns')
+            self.assertEqual(columns, {'id': [1, 2]})
+
+            users = list(client.users.iter_all(_fields=['id']))
+            self.assertEqual([user.payload for user in users], [{'id': 1}, {'id': 2}])
+
+    def test_param(self):
+        client = Client(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/articles?fields%5Barticles%5D=title,id', match_querystring=True, json=[
+                {'id': 1, 'title': 'Title'},
+            ])
+            rsps.add(responses.GET, MOCK_API_URL + '/users?fields=id', match_querystring=True, json=[
+                {'id': 1, 'username': 'user1'},
+            ])
+
+            self.assertEqual(client.articles.all(_fields=['title'])[0].payload, {'title': 'Title', 'id': 1})
+            self.assertEqual(client.users.all(_fields=['id'])[0].payload, {'id': 1, 'username': 'user1'})
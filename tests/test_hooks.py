@@ -0,0 +1,114 @@
+from unittest import TestCase
+
+import responses
+
+from genericclient import GenericClient
+from genericclient.metrics import Histogram, Metrics
+from genericclient.pagination import link_header
+from genericclient.retry import Retry
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class HooksTestCase(TestCase):
+
+    def test_events(self):
+        events = []
+
+        def hook(name):
+            return lambda **event: events.append((name, event))
+
+        client = GenericClient(
+            url=MOCK_API_URL,
+            autopaginate=link_header,
+            retry=Retry(backoff_factor=0),
+            hooks={name: hook(name) for name in ('before_request', 'after_response', 'on_retry', 'on_page')},
+        )
+        client.register_hook('after_pages', hook('after_pages'))
+        with self.assertRaises(ValueError):
+            client.register_hook('on_error', hook('on_error'))
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', status=503)
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}], headers={
+                'link': '<' + MOCK_API_URL + '/users?page=2>; rel=next',
+            })
+            rsps.add(responses.GET, MOCK_API_URL + '/users?page=2', json=[{'id': 2}, {'id': 3}])
+
+            client.users.all()
+
+        self.assertEqual([name for name, _ in events], [
+            'before_request', 'on_retry', 'after_response', 'on_page',
+            'before_request', 'after_response', 'on_page',
+            'after_pages',
+        ])
+        before, retry, after, page = [event for _, event in events[:4]]
+        self.assertEqual(before['route'], 'users')
+        self.assertEqual(before['method'], 'get')
+        self.assertEqual(retry['response'].status_code, 503)
+        self.assertEqual(after['response'].data, [{'id': 1}])
+        self.assertEqual(set(after['timings']), {'wait', 'request', 'decode'})
+        self.assertTrue(after['elapsed'] >= after['timings']['decode'])
+        self.assertEqual(after['bytes_in'], len(b'[{"id": 1}]'))
+        self.assertEqual(page['page'], 1)
+        self.assertEqual(events[-1][1]['pages'], 2)
+        self.assertEqual(events[-1][1]['items'], 3)
+
+    def test_before_request_headers(self):
+        def add_header(kwargs, **event):
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **{'X-Request-Id': 'abc'})
+
+        client = GenericClient(url=MOCK_API_URL, hooks={'before_request': add_header})
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1})
+            client.users.get(id=1)
+            self.assertEqual(rsps.calls[0].request.headers['X-Request-Id'], 'abc')
+
+
+class MetricsTestCase(TestCase):
+
+    def test_histogram(self):
+        histogram = Histogram(buckets=(1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+        self.assertEqual(histogram.to_dict(), {'buckets': {1: 2, 5: 3}, 'count': 4, 'sum': 14.5})
+
+    def test_metrics(self):
+        metrics = Metrics()
+        client = GenericClient(url=MOCK_API_URL, metrics=metrics, retry=Retry(backoff_factor=0))
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}])
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', status=502)
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1})
+            rsps.add(responses.POST, MOCK_API_URL + '/users/1/lock', json={})
+            rsps.add(responses.POST, MOCK_API_URL + '/users/ping', json={})
+
+            client.users.all()
+            client.users.get(id=1)
+            client.users(id=1).lock(reason='spam')
+            client.users().ping()
+
+        routes = {(route['method'], route['route']): route for route in metrics.to_dict()['routes']}
+        self.assertEqual(sorted(routes), [
+            ('GET', 'users'), ('GET', 'users/{pk}'), ('POST', 'users/ping'), ('POST', 'users/{pk}/lock'),
+        ])
+        self.assertEqual(routes['GET', 'users/{pk}']['statuses'], {200: 1})
+        self.assertEqual(routes['GET', 'users/{pk}']['retries'], 1)
+        self.assertEqual(routes['POST', 'users/{pk}/lock']['bytes_out'], len(client._json_backend.dumps({'reason': 'spam'})))
+        self.assertEqual(routes['GET', 'users']['duration']['count'], 1)
+        self.assertEqual(metrics.to_dict()['pages']['users']['count'], 1)
+
+        text = metrics.to_prometheus()
+        self.assertIn('# TYPE genericclient_request_duration_seconds histogram', text)
+        self.assertIn(
+            'genericclient_responses_total{endpoint="users",method="GET",route="users/{pk}",status="200"} 1', text,
+        )
+        self.assertIn('genericclient_retries_total{endpoint="users",method="GET",route="users/{pk}"} 1', text)
+        self.assertIn('genericclient_pagination_pages_bucket{endpoint="users",le="1"} 1', text)
+        self.assertIn(
+            'genericclient_request_duration_seconds_count{endpoint="users",method="GET",route="users"} 1', text,
+        )
+
+        metrics.reset()
+        self.assertEqual(metrics.to_dict(), {'routes': [], 'pages': {}})
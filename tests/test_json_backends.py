@@ -0,0 +1,101 @@
+import json
+from unittest import TestCase
+
+import responses
+
+from genericclient import GenericClient
+from genericclient.json_backends import JSONBackend, get_backend
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class RecordingBackend(object):
+    def __init__(self):
+        self.calls = []
+
+    def dumps(self, obj):
+        self.calls.append('dumps')
+        return json.dumps(obj)
+
+    def loads(self, s):
+        self.calls.append(('loads', type(s)))
+        return json.loads(s)
+
+
+class JSONBackendTestCase(TestCase):
+    def test_get_backend(self):
+        backend = get_backend('json')
+        self.assertEqual(backend.name, 'json')
+        self.assertEqual(backend.loads(backend.dumps({'a': [1]}).encode('utf-8')), {'a': [1]})
+
+        self.assertEqual(get_backend(json).name, 'json')
+        self.assertIs(get_backend(backend), backend)
+        self.assertIsInstance(get_backend(), JSONBackend)
+        self.assertEqual(get_backend().name, 'json')
+
+        with self.assertRaises(ValueError):
+            get_backend('yaml')
+        with self.assertRaises(TypeError):
+            get_backend(object())
+
+    def test_orjson_keys(self):
+        try:
+            backend = get_backend('orjson')
+        except ImportError:
+            self.skipTest('orjson is not installed')
+        self.assertEqual(json.loads(backend.dumps({1: 'a'})), {'1': 'a'})
+
+    def test_client_backend(self):
+        backend = RecordingBackend()
+        client = GenericClient(url=MOCK_API_URL, json_backend=backend)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, MOCK_API_URL + '/users', json={
+                'id': 1,
+                'username': 'user1',
+            }, status=201)
+
+            user = client.users.create({'username': 'user1'})
+            self.assertEqual(user.id, 1)
+            self.assertEqual(json.loads(rsps.calls[0].request.body), {'username': 'user1'})
+            self.assertEqual(rsps.calls[0].request.headers['Content-Type'], 'application/json')
+            self.assertEqual(backend.calls, ['dumps', ('loads', bytes)])
+
+    def test_text_dumps(self):
+        backend = JSONBackend('text', lambda obj: json.dumps(obj, ensure_ascii=False), json.loads)
+        self.assertEqual(backend.encode({'name': u'caf\u00e9'}), b'{"name": "caf\xc3\xa9"}')
+
+        client = GenericClient(url=MOCK_API_URL, json_backend=backend)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, MOCK_API_URL + '/users', json={
+                'id': 1,
+                'username': u'caf\u00e9',
+            }, status=201)
+
+            client.users.create({'username': u'caf\u00e9'})
+            self.assertEqual(rsps.calls[0].request.body, b'{"username": "caf\xc3\xa9"}')
+
+    def test_custom_session(self):
+        import requests
+
+        client = GenericClient(url=MOCK_API_URL, session=requests.session(), json_backend='json')
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.PUT, MOCK_API_URL + '/users/1', json={
+                'id': 1,
+                'username': 'user1',
+            })
+
+            client.users.create_or_update({'id': 1, 'username': 'user1'})
+            self.assertEqual(rsps.calls[0].request.headers['Content-Type'], 'application/json')
+
+    def test_latin1_response(self):
+        client = GenericClient(url=MOCK_API_URL, json_backend='json')
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET, MOCK_API_URL + '/users',
+                body='[{"username": "\xe8"}]'.encode('latin-1'),
+                content_type='application/json; charset=latin-1',
+            )
+
+            users = client.users.all()
+            self.assertEqual(users[0].username, '\xe8')
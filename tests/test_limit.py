@@ -0,0 +1,141 @@
+import json
+from unittest import TestCase
+
+import responses
+
+from genericclient import Endpoint, GenericClient
+from genericclient.pagination import OffsetLimit, PageNumber, link_header
+
+try:
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from urlparse import parse_qs, urlparse
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+def query(request):
+    return {key: values[0] for key, values in parse_qs(urlparse(request.url).query).items()}
+
+
+def link_callback(request):
+    page = int(query(request).get('page', 1))
+    headers = {}
+    if page < 10:
+        headers['link'] = '<{}/logs?page={}>; rel=next'.format(MOCK_API_URL, page + 1)
+    return (200, headers, json.dumps([{'id': page * 10 + i} for i in range(10)]))
+
+
+def page_callback(request):
+    params = query(request)
+    page, size = int(params['page']), int(params.get('page_size', 10))
+    ids = range((page - 1) * size, min(page * size, 100))
+    return (200, {}, json.dumps({'results': [{'id': i} for i in ids], 'count': 100}))
+
+
+class LogEndpoint(Endpoint):
+    page_size_param = 'page_size'
+
+
+class LinkClient(GenericClient):
+    endpoint_classes = {
+        'logs': LogEndpoint,
+    }
+
+
+class LimitTestCase(TestCase):
+
+    def test_filter_limit(self):
+        client = LinkClient(url=MOCK_API_URL, autopaginate=link_header)
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback)
+
+            logs = client.logs.filter(level='error', _limit=25)
+            self.assertEqual([log.id for log in logs], list(range(10, 35)))
+            self.assertEqual(len(rsps.calls), 3)
+            self.assertEqual(query(rsps.calls[0].request), {'level': 'error', 'page_size': '25'})
+
+    def test_iter_filter_limit(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=link_header)
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback)
+
+            self.assertEqual(len(list(client.logs.iter_all(_limit=15))), 15)
+            self.assertEqual(len(rsps.calls), 2)
+            self.assertNotIn('page_size', query(rsps.calls[0].request))
+
+    def test_page_size(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=PageNumber(max_items=60))
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=page_callback)
+
+            self.assertEqual([log.id for log in client.logs.all(_limit=5)], list(range(5)))
+            self.assertEqual(query(rsps.calls[0].request), {'page': '1', 'page_size': '5'})
+            self.assertEqual(len(rsps.calls), 1)
+
+            self.assertEqual(len(client.logs.all()), 60)
+            self.assertEqual(query(rsps.calls[1].request)['page_size'], '60')
+
+    def test_query_slice(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=OffsetLimit(limit=10))
+        with responses.RequestsMock() as rsps:
+            def callback(request):
+                params = query(request)
+                offset, limit = int(params['offset']), int(params['limit'])
+                return (200, {}, json.dumps({
+                    'results': [{'id': i} for i in range(offset, offset + limit)], 'count': 1000,
+                }))
+
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=callback)
+
+            logs = client.logs.query(level='error')[:15]
+            self.assertEqual([log.id for log in logs], list(range(15)))
+            self.assertEqual(logs.response.data['count'], 1000)
+            self.assertEqual([query(call.request)['limit'] for call in rsps.calls], ['10', '5'])
+
+            self.assertEqual([log.id for log in client.logs.query()[2:6:2]], [2, 4])
+            self.assertEqual(client.logs.query()[3].id, 3)
+            self.assertEqual(query(rsps.calls[-1].request), {'offset': '0', 'limit': '4'})
+
+    def test_get_stops_after_two(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=link_header)
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/logs', callback=link_callback)
+
+            with self.assertRaises(client.MultipleResourcesFound):
+                client.logs.get(level='error')
+            self.assertEqual(len(rsps.calls), 1)
+
+    def test_get_envelope(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=OffsetLimit())
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/logs', json={'results': [{'id': 7}], 'count': 1})
+
+            self.assertEqual(client.logs.get(name='abc').id, 7)
+            self.assertEqual(query(rsps.calls[0].request), {'name': 'abc', 'offset': '0', 'limit': '2'})
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/logs', json={'results': [], 'count': 0})
+
+            with self.assertRaises(client.ResourceNotFound):
+                client.logs.get(name='abc')
+
+    def test_get_object(self):
+        for paginator in (None, link_header):
+            client = GenericClient(url=MOCK_API_URL, autopaginate=paginator)
+            with responses.RequestsMock() as rsps:
+                rsps.add(responses.GET, MOCK_API_URL + '/users?name=x', json={'id': 3, 'name': 'x'},
+                         match_querystring=True)
+
+                self.assertEqual(client.users.get(name='x').id, 3)
+
+    def test_get_not_found(self):
+        for paginator in (None, link_header):
+            client = GenericClient(url=MOCK_API_URL, autopaginate=paginator)
+            with responses.RequestsMock() as rsps:
+                rsps.add(responses.GET, MOCK_API_URL + '/users?name=x', json={'detail': 'Not found.'}, status=404,
+                         match_querystring=True)
+
+                with self.assertRaises(client.ResourceNotFound):
+                    client.users.get(name='x')
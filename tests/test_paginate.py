@@ -1,9 +1,16 @@
+import json
 from unittest import TestCase
 
 import responses
 
+try:
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from urlparse import parse_qs, urlparse
+
 from genericclient import GenericClient
 from genericclient_base.pagination import link_header
+from genericclient.pagination import EnvelopeCursor, OffsetLimit, PageNumber, PrefetchLinkHeader
 
 
 MOCK_API_URL = 'http://dummy.org'
@@ -35,3 +42,235 @@ class EndpointTestCase(TestCase):
             self.assertEqual(users[0].id, 1)
             self.assertEqual(users[1].id, 2)
             self.assertEqual(users[2].id, 3)
+
+    def test_iter_all(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[
+                {'id': 1},
+            ], headers={
+                'link': '<' + MOCK_API_URL + '/users?page=2>; rel=next',
+            }, match_querystring=True)
+            rsps.add(responses.GET, MOCK_API_URL + '/users?page=2', json=[
+                {'id': 2},
+                {'id': 3},
+            ], match_querystring=True)
+
+            users = generic_client.users.iter_all()
+            self.assertEqual(next(users).id, 1)
+            self.assertEqual([user.id for user in users], [2, 3])
+
+    def test_iter_all_close(self):
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[
+                {'id': 1},
+            ], headers={
+                'link': '<' + MOCK_API_URL + '/users?page=2>; rel=next',
+            }, match_querystring=True)
+            rsps.add(responses.GET, MOCK_API_URL + '/users?page=2', json=[
+                {'id': 2},
+            ], headers={
+                'link': '<' + MOCK_API_URL + '/users?page=3>; rel=next',
+            }, match_querystring=True)
+
+            users = generic_client.users.iter_all()
+            self.assertEqual(next(users).id, 1)
+            users.close()
+            self.assertTrue(len(rsps.calls) <= 2)
+
+
+prefetch_client = GenericClient(url=MOCK_API_URL, autopaginate=PrefetchLinkHeader(max_workers=3))
+
+
+class PrefetchTestCase(TestCase):
+    def add_page(self, rsps, page, links):
+        url = MOCK_API_URL + '/users'
+        if page > 1:
+            url += '?page={}'.format(page)
+        rsps.add(responses.GET, url, json=[
+            {'id': page},
+        ], headers={
+            'link': ', '.join('<{}>; rel={}'.format(link, rel) for rel, link in links.items()),
+        }, match_querystring=True)
+
+    def test_prefetch_last(self):
+        last = MOCK_API_URL + '/users?page=5'
+        with responses.RequestsMock() as rsps:
+            for page in range(1, 6):
+                links = {'last': last}
+                if page < 5:
+                    links['next'] = MOCK_API_URL + '/users?page={}'.format(page + 1)
+                self.add_page(rsps, page, links)
+
+            users = prefetch_client.users.all()
+            self.assertEqual([user.id for user in users], [1, 2, 3, 4, 5])
+            self.assertEqual(users.response.data, [{'id': 5}])
+            self.assertEqual(len(rsps.calls), 5)
+
+    def test_prefetch_speculative(self):
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            for page in range(1, 5):
+                links = {}
+                if page < 4:
+                    links['next'] = MOCK_API_URL + '/users?page={}'.format(page + 1)
+                self.add_page(rsps, page, links)
+
+            users = prefetch_client.users.all()
+            self.assertEqual([user.id for user in users], [1, 2, 3, 4])
+            self.assertEqual(users.response.data, [{'id': 4}])
+
+    def test_prefetch_cursor(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[
+                {'id': 1},
+            ], headers={
+                'link': '<' + MOCK_API_URL + '/users?cursor=abc>; rel=next',
+            }, match_querystring=True)
+            rsps.add(responses.GET, MOCK_API_URL + '/users?cursor=abc', json=[
+                {'id': 2},
+            ], match_querystring=True)
+
+            users = prefetch_client.users.all()
+            self.assertEqual([user.id for user in users], [1, 2])
+
+    def test_prefetch_iter_all(self):
+        last = MOCK_API_URL + '/users?page=4'
+        with responses.RequestsMock() as rsps:
+            for page in range(1, 5):
+                links = {'last': last}
+                if page < 4:
+                    links['next'] = MOCK_API_URL + '/users?page={}'.format(page + 1)
+                self.add_page(rsps, page, links)
+
+            users = prefetch_client.users.iter_all()
+            self.assertEqual([user.id for user in users], [1, 2, 3, 4])
+
+
+def query(request):
+    return {key: values[0] for key, values in parse_qs(urlparse(request.url).query).items()}
+
+
+def offset_callback(count=None, total=25, cap=None):
+    def callback(request):
+        params = query(request)
+        offset, limit = int(params['offset']), int(params['limit'])
+        if cap is not None:
+            limit = min(limit, cap)
+        body = {'results': [{'id': i} for i in range(offset, min(offset + limit, total))]}
+        if count is not None:
+            body['count'] = count
+        return (200, {}, json.dumps(body))
+    return callback
+
+
+def page_callback(count=True):
+    def callback(request):
+        page = int(query(request)['page'])
+        ids = range((page - 1) * 10, min(page * 10, 25))
+        body = {'results': [{'id': i} for i in ids], 'next': 'more' if page < 3 else None}
+        if count:
+            body['count'] = 25
+        return (200, {}, json.dumps(body))
+    return callback
+
+
+class EnvelopeTestCase(TestCase):
+
+    def test_cursor(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=EnvelopeCursor())
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users?active=1', json={
+                'results': [{'id': 1}], 'next': 'abc',
+            }, match_querystring=True)
+            rsps.add(responses.GET, MOCK_API_URL + '/users?active=1&cursor=abc', json={
+                'results': [{'id': 2}], 'next': MOCK_API_URL + '/users?active=1&cursor=def',
+            }, match_querystring=True)
+            rsps.add(responses.GET, MOCK_API_URL + '/users?active=1&cursor=def', json={
+                'results': [{'id': 3}], 'next': None,
+            }, match_querystring=True)
+
+            users = client.users.filter(active=1)
+            self.assertEqual([user.id for user in users], [1, 2, 3])
+            self.assertEqual(users.response.data['results'], [{'id': 3}])
+
+    def test_cursor_max_items(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=EnvelopeCursor(max_items=3))
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json={
+                'results': [{'id': 1}, {'id': 2}], 'next': 'abc',
+            }, match_querystring=True)
+            rsps.add(responses.GET, MOCK_API_URL + '/users?cursor=abc', json={
+                'results': [{'id': 3}, {'id': 4}], 'next': 'def',
+            }, match_querystring=True)
+
+            self.assertEqual([user.id for user in client.users.all()], [1, 2, 3])
+            self.assertEqual(len(rsps.calls), 2)
+
+    def test_offset_limit(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=OffsetLimit(limit=10, max_workers=2))
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users', callback=offset_callback(count=25))
+
+            users = client.users.all()
+            self.assertEqual([user.id for user in users], list(range(25)))
+            self.assertEqual(
+                sorted(int(query(call.request)['offset']) for call in rsps.calls), [0, 10, 20],
+            )
+
+    def test_offset_limit_max_items(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=OffsetLimit(limit=10, max_items=15))
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users', callback=offset_callback(count=25))
+
+            users = client.users.all()
+            self.assertEqual([user.id for user in users], list(range(15)))
+            self.assertEqual([query(call.request)['limit'] for call in rsps.calls], ['10', '5'])
+
+    def test_offset_limit_without_count(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=OffsetLimit(limit=10))
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users', callback=offset_callback())
+
+            users = client.users.iter_all()
+            self.assertEqual([user.id for user in users], list(range(25)))
+            self.assertEqual(len(rsps.calls), 3)
+
+    def test_offset_limit_capped(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=OffsetLimit(limit=100))
+        for count in (250, None):
+            with responses.RequestsMock() as rsps:
+                rsps.add_callback(
+                    responses.GET, MOCK_API_URL + '/users', callback=offset_callback(count, total=250, cap=50),
+                )
+
+                self.assertEqual([user.id for user in client.users.all()], list(range(250)))
+                self.assertEqual(
+                    sorted(int(query(call.request)['offset']) for call in rsps.calls)[:5], [0, 50, 100, 150, 200],
+                )
+
+    def test_page_number(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=PageNumber(max_workers=2))
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users', callback=page_callback())
+
+            users = client.users.filter(active=1)
+            self.assertEqual([user.id for user in users], list(range(25)))
+            self.assertEqual(sorted(query(call.request)['page'] for call in rsps.calls), ['1', '2', '3'])
+            self.assertTrue(all(query(call.request)['active'] == '1' for call in rsps.calls))
+
+    def test_page_number_max_items(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=PageNumber(page_size=10, max_items=12))
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users', callback=page_callback())
+
+            users = client.users.all()
+            self.assertEqual([user.id for user in users], list(range(12)))
+            self.assertEqual(len(rsps.calls), 2)
+            self.assertEqual(query(rsps.calls[0].request)['page_size'], '10')
+
+    def test_page_number_without_count(self):
+        client = GenericClient(url=MOCK_API_URL, autopaginate=PageNumber())
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users', callback=page_callback(count=False))
+
+            self.assertEqual([user.id for user in client.users.all()], list(range(25)))
+            self.assertEqual(len(rsps.calls), 3)
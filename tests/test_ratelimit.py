@@ -0,0 +1,127 @@
+import threading
+import time
+from unittest import TestCase
+
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+
+from genericclient import GenericClient
+from genericclient.ratelimit import RateLimiter, TokenBucket
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class TokenBucketTestCase(TestCase):
+
+    def test_rate(self):
+        bucket = TokenBucket(rate=50, burst=2)
+        started = time.time()
+        for _ in range(7):
+            bucket.acquire()
+        # 2 in the initial burst, then 5 at 50 per second
+        self.assertTrue(0.08 <= time.time() - started < 0.5)
+
+    def test_unlimited(self):
+        bucket = TokenBucket()
+        started = time.time()
+        for _ in range(1000):
+            bucket.acquire()
+        self.assertTrue(time.time() - started < 0.5)
+
+    def test_limit_and_pause(self):
+        bucket = TokenBucket()
+        bucket.limit(20, time.time() + 60)
+        self.assertEqual(bucket.effective_rate, 20)
+        bucket.limit(20, time.time() - 1)
+        self.assertIsNone(bucket.effective_rate)
+
+        bucket.pause(time.time() + 0.1)
+        started = time.time()
+        bucket.acquire()
+        self.assertTrue(time.time() - started >= 0.09)
+
+
+class RateLimiterTestCase(TestCase):
+
+    def test_update(self):
+        limiter = RateLimiter(rate=100)
+        now = time.time()
+        limiter.update(200, {'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': '5'})
+        self.assertAlmostEqual(limiter.bucket.effective_rate, 2, places=1)
+
+        limiter.update(200, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(int(now) + 30)})
+        self.assertTrue(limiter.bucket._paused_until >= now + 28)
+
+        limiter = RateLimiter()
+        limiter.update(429, {'Retry-After': '3'})
+        self.assertTrue(limiter.bucket._paused_until >= now + 3)
+        limiter.update(200, {'X-RateLimit-Remaining': 'many', 'X-RateLimit-Reset': '5'})
+
+        limiter = RateLimiter(adaptive=False)
+        limiter.update(429, {'Retry-After': '3'})
+        self.assertEqual(limiter.bucket._paused_until, 0)
+
+    def test_max_in_flight(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def callback(request):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+            return (200, {}, '{"id": 1}')
+
+        client = GenericClient(
+            url=MOCK_API_URL,
+            rate_limit=RateLimiter(max_in_flight=5),
+            endpoint_rate_limits={'users': RateLimiter(max_in_flight=2)},
+        )
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users/1', callback=callback)
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/groups/1', callback=callback)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda _: client.users.get(id=1), range(8)))
+            self.assertEqual(max(peak), 2)
+
+            del peak[:]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda _: client.groups.get(id=1), range(16)))
+            self.assertEqual(max(peak), 5)
+
+    def test_max_in_flight_stream(self):
+        limiter = RateLimiter(max_in_flight=1)
+        client = GenericClient(url=MOCK_API_URL, stream_json=True, rate_limit=limiter)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', body='[{"id": 1}, {"id": 2}]')
+
+            users = client.users.iter_filter()
+            self.assertEqual(next(users).id, 1)
+            # The rest of the body is still to be read.
+            self.assertFalse(limiter._semaphore.acquire(False))
+            self.assertEqual([user.id for user in users], [2])
+            self.assertTrue(limiter._semaphore.acquire(False))
+            limiter.release()
+
+            self.assertEqual(len(client.users.all()), 2)
+            self.assertTrue(limiter._semaphore.acquire(False))
+            limiter.release()
+
+    def test_client(self):
+        limiter = RateLimiter()
+        client = GenericClient(url=MOCK_API_URL, rate_limit=limiter)
+        self.assertEqual(client._get_rate_limiters('users'), [limiter])
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[], headers={
+                'X-RateLimit-Remaining': '100',
+                'X-RateLimit-Reset': '10',
+            })
+
+            client.users.all()
+            self.assertAlmostEqual(limiter.bucket.effective_rate, 10, places=0)
@@ -0,0 +1,124 @@
+import time
+from unittest import TestCase
+
+import requests
+import responses
+
+from genericclient import GenericClient
+from genericclient.pagination import link_header
+from genericclient.retry import Retry
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class RetryTestCase(TestCase):
+
+    def make_client(self, **kwargs):
+        self.retries = []
+        kwargs.setdefault('backoff_factor', 0)
+        retry = Retry(on_retry=lambda **event: self.retries.append(event), **kwargs)
+        return GenericClient(url=MOCK_API_URL, retry=retry)
+
+    def test_statuses(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', status=503, body='<html>Unavailable</html>')
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', status=429)
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1})
+
+            self.assertEqual(client.users.get(id=1).id, 1)
+            self.assertEqual(len(rsps.calls), 3)
+            self.assertEqual(client._retry.retries, 2)
+            self.assertEqual([event['attempt'] for event in self.retries], [1, 2])
+            self.assertEqual(self.retries[0]['response'].status_code, 503)
+            self.assertEqual(self.retries[0]['url'], MOCK_API_URL + '/users/1')
+
+    def test_max_attempts(self):
+        client = self.make_client(max_attempts=2)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.DELETE, MOCK_API_URL + '/users/1', status=502)
+
+            with self.assertRaises(client.HTTPError) as excinfo:
+                client.users.delete(1)
+            self.assertEqual(excinfo.exception.response.status_code, 502)
+            self.assertEqual(len(rsps.calls), 2)
+
+    def test_not_idempotent(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, MOCK_API_URL + '/users', status=503)
+
+            with self.assertRaises(client.HTTPError):
+                client.users.create({'username': 'user1'})
+            self.assertEqual(len(rsps.calls), 1)
+            self.assertEqual(self.retries, [])
+
+    def test_exceptions(self):
+        client = self.make_client()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', body=requests.ConnectionError('reset'))
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}])
+
+            self.assertEqual(len(client.users.all()), 1)
+            self.assertIsInstance(self.retries[0]['exception'], requests.ConnectionError)
+
+        client = self.make_client(max_attempts=2)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', body=requests.ConnectionError('reset'))
+
+            with self.assertRaises(requests.ConnectionError):
+                client.users.all()
+            self.assertEqual(len(rsps.calls), 2)
+
+    def test_paginate(self):
+        client = self.make_client()
+        client.autopaginate = link_header
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}], headers={
+                'link': '<' + MOCK_API_URL + '/users?page=2>; rel=next',
+            })
+            rsps.add(responses.GET, MOCK_API_URL + '/users?page=2', status=504)
+            rsps.add(responses.GET, MOCK_API_URL + '/users?page=2', json=[{'id': 2}])
+
+            users = client.users.all()
+            self.assertEqual([user.id for user in users], [1, 2])
+            self.assertEqual(len(rsps.calls), 3)
+
+
+class RetryPolicyTestCase(TestCase):
+
+    def test_backoff(self):
+        retry = Retry(backoff_factor=1, backoff_max=5, jitter=False)
+        self.assertEqual([retry.backoff(attempt) for attempt in range(1, 5)], [1, 2, 4, 5])
+        retry = Retry(backoff_factor=1, backoff_max=5)
+        for attempt in range(1, 5):
+            self.assertTrue(0 <= retry.backoff(attempt) <= 5)
+
+    def test_retry_after(self):
+        retry = Retry(backoff_max=30)
+        self.assertEqual(retry.parse_retry_after({'Retry-After': '12'}), 12)
+        self.assertIsNone(retry.parse_retry_after({}))
+        self.assertIsNone(retry.parse_retry_after({'Retry-After': 'soon'}))
+        date = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 20))
+        self.assertTrue(15 < retry.parse_retry_after({'Retry-After': date}) <= 20)
+
+        response = requests.Response()
+        response.status_code = 429
+        response.headers['Retry-After'] = '7'
+        self.assertEqual(retry.get_delay('get', 1, time.time(), response=response), 7)
+        response.headers['Retry-After'] = '3600'
+        self.assertIsNone(retry.get_delay('get', 1, time.time(), response=response))
+
+    def test_deadline(self):
+        retry = Retry(backoff_factor=10, jitter=False, deadline=15)
+        response = requests.Response()
+        response.status_code = 503
+        self.assertEqual(retry.get_delay('get', 1, time.time(), response=response), 10)
+        self.assertIsNone(retry.get_delay('get', 2, time.time(), response=response))
+        self.assertIsNone(retry.get_delay('get', 1, time.time() - 10, response=response))
+
+    def test_client_shortcut(self):
+        client = GenericClient(url=MOCK_API_URL, retry=5)
+        self.assertEqual(client._retry.max_attempts, 5)
+        self.assertIsNone(GenericClient(url=MOCK_API_URL)._retry)
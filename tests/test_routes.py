@@ -57,3 +57,37 @@ class EndpointTestCase(TestCase):
 
             response = generic_client.users(_method='get').notify(unread=3)
             self.assertEqual(response.data, {'unread': 3})
+
+    def test_endpoint_memoized(self):
+        client = GenericClient(url=MOCK_API_URL)
+        self.assertIs(client.users, client.users)
+        self.assertIs(client.users, client['users'])
+        self.assertIsNot(client.users, client.groups)
+
+    def test_action_urls(self):
+        client = GenericClient(url=MOCK_API_URL, trailing_slash=True)
+        action = client.users(id=2).notify
+        self.assertEqual(action.url, MOCK_API_URL + '/users/2/notify/')
+        self.assertEqual(action.route, 'users/{pk}/notify')
+        self.assertEqual(action.pk, 2)
+        self.assertFalse(hasattr(action, '__dict__'))
+        self.assertEqual(client.users(uuid='a-b').notify.url, MOCK_API_URL + '/users/a-b/notify/')
+        self.assertEqual(client.users().notify.url, MOCK_API_URL + '/users/notify/')
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(
+                responses.POST, MOCK_API_URL + '/users/2/notify/',
+                callback=request_callback,
+                content_type='application/json',
+            )
+
+            response = client.users(id=2).notify(unread=3)
+            self.assertEqual(response.data, {'unread': 3})
+
+    def test_url_templates_per_client(self):
+        client = GenericClient(url=MOCK_API_URL)
+        other = GenericClient(url=MOCK_API_URL, trailing_slash=True)
+        self.assertEqual(client.users(id=2).notify.url, MOCK_API_URL + '/users/2/notify')
+        self.assertEqual(other.users(id=2).notify.url, MOCK_API_URL + '/users/2/notify/')
+        self.assertEqual(list(client.users._url_templates), ['notify'])
+        self.assertFalse(hasattr(client.groups, '_url_templates'))
@@ -0,0 +1,91 @@
+import threading
+import time
+from unittest import TestCase
+
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+
+from genericclient import GenericClient
+from genericclient.singleflight import SingleFlight
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class SingleFlightTestCase(TestCase):
+
+    def test_do(self):
+        single_flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return object()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            leader = executor.submit(single_flight.do, 'key', slow)
+            started.wait()
+            followers = [executor.submit(single_flight.do, 'key', slow) for _ in range(7)]
+            time.sleep(0.05)
+            release.set()
+            results = [future.result() for future in [leader] + followers]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(id(result) for result in results)), 1)
+        self.assertEqual(len(single_flight), 0)
+        single_flight.do('key', slow)
+        self.assertEqual(len(calls), 2)
+
+    def test_exception(self):
+        single_flight = SingleFlight(ttl=60)
+
+        def fail():
+            raise KeyError('boom')
+
+        with self.assertRaises(KeyError):
+            single_flight.do('key', fail)
+        self.assertEqual(len(single_flight), 0)
+
+    def test_ttl(self):
+        single_flight = SingleFlight(ttl=0.05)
+        self.assertEqual(single_flight.do('key', lambda: 1), 1)
+        self.assertEqual(single_flight.do('key', lambda: 2), 1)
+        time.sleep(0.06)
+        self.assertEqual(single_flight.do('other', lambda: 3), 3)
+        self.assertEqual(len(single_flight), 1)
+        self.assertEqual(single_flight.do('key', lambda: 2), 2)
+
+    def test_client(self):
+        client = GenericClient(url=MOCK_API_URL, coalesce=True, coalesce_ttl=60)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/accounts/42', json={'id': 42})
+            rsps.add(responses.GET, MOCK_API_URL + '/accounts', json=[{'id': 42}])
+            rsps.add(responses.PUT, MOCK_API_URL + '/accounts/42', json={'id': 42})
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                accounts = list(executor.map(lambda _: client.accounts.get(id=42), range(16)))
+            self.assertEqual(set(account.id for account in accounts), {42})
+            self.assertEqual(len(rsps.calls), 1)
+
+            client.accounts.filter(id__in=[42])
+            client.accounts.filter(id__in=[42])
+            self.assertEqual(len(rsps.calls), 2)
+
+            accounts[0].save()
+            client.accounts.get(id=42)
+            self.assertEqual(len(rsps.calls), 4)
+
+    def test_client_copies(self):
+        client = GenericClient(url=MOCK_API_URL, coalesce=True, coalesce_ttl=60)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/accounts/42', json={'id': 42, 'tags': ['a']})
+
+            account = client.accounts.get(id=42)
+            account.tags.append('b')
+            self.assertEqual(client.accounts.get(id=42).tags, ['a'])
+            self.assertEqual(len(rsps.calls), 1)
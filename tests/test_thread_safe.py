@@ -0,0 +1,93 @@
+import json
+import threading
+from unittest import TestCase
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+except ImportError:
+    ThreadingHTTPServer = None
+
+from concurrent.futures import ThreadPoolExecutor
+
+from genericclient import GenericClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        headers = {}
+        if path == '/login':
+            headers['Set-Cookie'] = 'name={}; Path=/'.format(query.split('=', 1)[1])
+            data = {}
+        else:
+            cookie = self.headers.get('Cookie', '')
+            data = {'id': int(path.rsplit('/', 1)[1]), 'cookie': cookie}
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadSafeTestCase(TestCase):
+    def setUp(self):
+        if ThreadingHTTPServer is None:
+            self.skipTest("ThreadingHTTPServer is not available")
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_session_per_thread(self):
+        client = GenericClient(url=self.url, thread_safe=True, auth=('user', 'password'))
+        sessions = []
+        barrier = threading.Barrier(4)
+
+        def get_session():
+            barrier.wait()
+            sessions.append(client.session)
+            return client.session
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for future in [executor.submit(get_session) for _ in range(4)]:
+                future.result()
+
+        self.assertIs(client.session, client.session)
+        self.assertEqual(len(set(id(session) for session in sessions + [client.session])), 5)
+        adapters = set(id(session.get_adapter(self.url)) for session in sessions)
+        self.assertEqual(adapters, {id(client.session.get_adapter(self.url))})
+        self.assertEqual(sessions[0].auth, ('user', 'password'))
+
+        with self.assertRaises(ValueError):
+            GenericClient(url=self.url, session=client.session, thread_safe=True)
+
+    def test_stress(self):
+        threads, calls = 16, 25
+        client = GenericClient(url=self.url, thread_safe=True, pool_maxsize=threads)
+
+        def work(name):
+            client.login.filter(name=name)
+            seen = []
+            for i in range(calls):
+                user = client.users.get(id=i)
+                seen.append((user.id, user.cookie))
+            return seen
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [executor.submit(work, 't{}'.format(n)) for n in range(threads)]
+            for n, future in enumerate(futures):
+                self.assertEqual(future.result(), [(i, 'name=t{}'.format(n)) for i in range(calls)])
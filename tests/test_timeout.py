@@ -0,0 +1,95 @@
+import time
+from unittest import TestCase
+
+import responses
+
+from genericclient import Endpoint, GenericClient
+from genericclient.pagination import link_header
+from genericclient.retry import Retry
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class SlowEndpoint(Endpoint):
+    timeout = 60
+
+
+class Client(GenericClient):
+    endpoint_classes = {
+        'reports': SlowEndpoint,
+    }
+
+
+class TimeoutTestCase(TestCase):
+
+    def test_default(self):
+        client = GenericClient(url=MOCK_API_URL)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[])
+            client.users.all()
+            self.assertIsNone(rsps.calls[0].request.req_kwargs['timeout'])
+
+    def test_timeout(self):
+        client = Client(url=MOCK_API_URL, timeout=(3.05, 10))
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}])
+            rsps.add(responses.GET, MOCK_API_URL + '/reports', json=[])
+            rsps.add(responses.GET, MOCK_API_URL + '/users/1', json={'id': 1})
+            rsps.add(responses.POST, MOCK_API_URL + '/users/1/lock', json={})
+
+            users = client.users.all()
+            client.reports.all()
+            client.users.get(id=1, _timeout=2)
+            client.users(id=1, _timeout=5).lock()
+
+            timeouts = [call.request.req_kwargs['timeout'] for call in rsps.calls]
+            self.assertEqual(timeouts, [(3.05, 10), 60, 2, 5])
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.PUT, MOCK_API_URL + '/users/1', json={'id': 1})
+            users[0].save()
+            self.assertEqual(rsps.calls[0].request.req_kwargs['timeout'], (3.05, 10))
+
+    def test_deadline(self):
+        client = GenericClient(url=MOCK_API_URL, timeout=(3.05, 10), deadline=1)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[{'id': 1}])
+            users = client.users.filter(_deadline=0.5)
+
+            connect, read = rsps.calls[0].request.req_kwargs['timeout']
+            self.assertTrue(0 < connect <= 0.5)
+            self.assertTrue(0 < read <= 0.5)
+
+        # The deadline ends with the call: it doesn't apply to the resources it returned.
+        time.sleep(0.5)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.PUT, MOCK_API_URL + '/users/1', json={'id': 1})
+            users[0].save()
+            self.assertTrue(0.5 < rsps.calls[0].request.req_kwargs['timeout'][1] <= 1)
+
+    def test_deadline_paginate(self):
+        def slow_page(request):
+            time.sleep(0.2)
+            return (200, {'link': '<' + MOCK_API_URL + '/users?page=2>; rel=next'}, '[{"id": 1}]')
+
+        client = GenericClient(url=MOCK_API_URL, autopaginate=link_header)
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            rsps.add_callback(responses.GET, MOCK_API_URL + '/users', callback=slow_page)
+
+            with self.assertRaises(client.DeadlineExceeded):
+                client.users.all(_deadline=0.1)
+            self.assertEqual(len(rsps.calls), 1)
+
+            with self.assertRaises(client.DeadlineExceeded):
+                list(client.users.iter_all(_deadline=0.1))
+
+    def test_deadline_retry(self):
+        client = GenericClient(url=MOCK_API_URL, retry=Retry(backoff_factor=0), deadline=0.5)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.DELETE, MOCK_API_URL + '/users/1', status=503, headers={'Retry-After': '1'})
+
+            with self.assertRaises(client.HTTPError) as excinfo:
+                client.users.delete(1)
+            self.assertEqual(excinfo.exception.response.status_code, 503)
+            self.assertEqual(len(rsps.calls), 1)
@@ -0,0 +1,113 @@
+import unittest
+from unittest import TestCase
+
+import responses
+
+from genericclient import GenericClient
+from genericclient.pagination import link_header
+from genericclient.retry import Retry
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    TracerProvider = None
+
+
+MOCK_API_URL = 'http://dummy.org'
+
+
+class NoTracingTestCase(TestCase):
+
+    def test_disabled(self):
+        client = GenericClient(url=MOCK_API_URL)
+        self.assertIsNone(client._tracer)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/users', json=[])
+            client.users.all()
+            self.assertNotIn('traceparent', rsps.calls[0].request.headers)
+
+
+@unittest.skipIf(TracerProvider is None, "opentelemetry-sdk is not installed")
+class TracingTestCase(TestCase):
+
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        self.tracer = provider.get_tracer('tests')
+
+    def spans(self):
+        return {span.name: span for span in self.exporter.get_finished_spans()}
+
+    def test_paginate(self):
+        client = GenericClient(
+            url=MOCK_API_URL, autopaginate=link_header, retry=Retry(backoff_factor=0), tracing=self.tracer,
+        )
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/orders', json=[{'id': 1}], headers={
+                'link': '<' + MOCK_API_URL + '/orders?page=2>; rel=next',
+            })
+            rsps.add(responses.GET, MOCK_API_URL + '/orders?page=2', status=503)
+            rsps.add(responses.GET, MOCK_API_URL + '/orders?page=2', json=[{'id': 2}, {'id': 3}])
+
+            client.orders.all()
+            traceparents = [call.request.headers['traceparent'] for call in rsps.calls]
+
+        finished = self.exporter.get_finished_spans()
+        spans = self.spans()
+        call = spans['orders.all']
+        self.assertEqual(
+            sorted(span.name for span in finished),
+            sorted(['orders.all', 'orders page 1', 'orders page 2', 'decode orders', 'decode orders'] +
+                   ['GET orders'] * 3),
+        )
+        for span in finished:
+            if span is not call:
+                self.assertEqual(span.parent.span_id, call.context.span_id)
+                self.assertEqual(span.context.trace_id, call.context.trace_id)
+
+        attempts = [span for span in finished if span.name == 'GET orders']
+        self.assertEqual([span.attributes['http.response.status_code'] for span in attempts], [200, 503, 200])
+        self.assertEqual(attempts[2].attributes['http.request.resend_count'], 1)
+        self.assertEqual(attempts[0].attributes['url.template'], 'orders')
+        self.assertEqual(spans['orders page 2'].attributes['genericclient.page.items'], 2)
+        self.assertEqual(
+            set(traceparent.split('-')[2] for traceparent in traceparents),
+            set('{:016x}'.format(span.context.span_id) for span in attempts),
+        )
+
+    def test_routes(self):
+        client = GenericClient(url=MOCK_API_URL, tracing=self.tracer)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/orders/12', json={'id': 12})
+            rsps.add(responses.POST, MOCK_API_URL + '/orders/12/cancel', json={})
+            rsps.add(responses.PUT, MOCK_API_URL + '/orders/12', json={'id': 12})
+
+            order = client.orders.get(id=12)
+            client.orders(id=12).cancel()
+            order.save()
+
+        spans = self.spans()
+        self.assertEqual(
+            set(spans), {
+                'orders.get', 'GET orders/{pk}', 'decode orders/{pk}',
+                'orders/{pk}/cancel', 'POST orders/{pk}/cancel', 'decode orders/{pk}/cancel',
+                'orders.put', 'PUT orders/{pk}',
+            },
+        )
+        self.assertEqual(spans['POST orders/{pk}/cancel'].parent.span_id, spans['orders/{pk}/cancel'].context.span_id)
+        self.assertEqual(spans['GET orders/{pk}'].attributes['url.full'], MOCK_API_URL + '/orders/12')
+
+    def test_error(self):
+        client = GenericClient(url=MOCK_API_URL, tracing=self.tracer)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, MOCK_API_URL + '/orders/12', status=404)
+
+            with self.assertRaises(client.ResourceNotFound):
+                client.orders.get(id=12)
+
+        spans = self.spans()
+        self.assertFalse(spans['orders.get'].status.is_ok)
+        self.assertFalse(spans['GET orders/{pk}'].status.is_ok)
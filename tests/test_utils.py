@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from genericclient.utils import JSONStream
+
+
+class JSONStreamTestCase(TestCase):
+    def chunked(self, text, size):
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def test_iter_items(self):
+        text = '[{"id": 1, "tags": ["a", "b"]}, 12345, -1.5e3, true, null, "x,]y", [] ]'
+        expected = [{'id': 1, 'tags': ['a', 'b']}, 12345, -1.5e3, True, None, 'x,]y', []]
+        for size in (1, 2, 3, 7, len(text)):
+            stream = JSONStream(self.chunked(text, size))
+            self.assertEqual(list(stream.iter_items()), expected)
+
+    def test_empty(self):
+        self.assertEqual(list(JSONStream(['[', ' ', ']']).iter_items()), [])
+
+    def test_not_an_array(self):
+        stream = JSONStream(['  {"id"', ': 1}'])
+        with self.assertRaises(ValueError):
+            list(stream.iter_items())
+        self.assertEqual(stream.text(), '  {"id": 1}')
+
+    def test_invalid(self):
+        for text in ('[1, 2', '[1 2]', '[1,]', '[1] 2'):
+            with self.assertRaises(ValueError):
+                list(JSONStream(self.chunked(text, 2)).iter_items())